@@ -11,6 +11,9 @@ Usage:
     python calibration.py metrics --simulated <csv_or_sql> --measured <csv>
         --variable <var_name>
         [--sim-column <col>] [--meas-column <col>] [--key-value <zone>]
+    python calibration.py compare-multi --simulated <csv_or_sql> --measured <csv>
+        --variables <var1,var2,...> --output-dir <dir>
+        [--meas-columns <col1,col2,...>] [--key-value <zone>] [--jobs <n>]
 
 Error metrics (ASHRAE Guideline 14):
     RMSE:     sqrt(mean((sim - meas)^2))
@@ -22,19 +25,60 @@ Error metrics (ASHRAE Guideline 14):
 """
 
 import argparse
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+import contextlib
 import csv
+import hashlib
+import importlib.util
+import io
+import json
 import math
+import operator
 import os
 import re
 import sqlite3
 import subprocess
 import sys
+import traceback
 
 
 # ---------------------------------------------------------------------------
 # Data loading
 # ---------------------------------------------------------------------------
 
+# Loaded series are kept column-wise: (months, days, hours, values) with the
+# time parts as signed-byte arrays and the values as doubles. That is 11
+# bytes per point instead of a (month, day, hour, value) tuple per point.
+_TS_TYPECODE = "b"
+_VALUE_TYPECODE = "d"
+
+
+def _new_series():
+    """Return empty (months, days, hours, values) columns."""
+    return (array(_TS_TYPECODE), array(_TS_TYPECODE), array(_TS_TYPECODE),
+            array(_VALUE_TYPECODE))
+
+
+# Compiled once; the datetime patterns are matched on every data row.
+_EP_DT_RE = re.compile(r'\s*(\d{1,2})/(\d{1,2})\s+(\d{1,2}):')
+_ISO_DT_RE = re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2})[T\s](\d{1,2})')
+_US_DT_RE = re.compile(r'(\d{1,2})/(\d{1,2})/\d{2,4}\s+(\d{1,2})')
+_UNITS_RE = re.compile(r'\[([^\]]+)\]')
+
+# Measured-CSV header names recognised as a single date/time column; when
+# several are present the right-most one is used.
+_DATETIME_HEADERS = (
+    "datetime",
+    "date_time",
+    "timestamp",
+    "date/time",
+    "date time",
+    "date",
+    "time",
+    "data",
+)
+
 
 def _normalize_header(value):
     """Normalize CSV header tokens for robust matching."""
@@ -42,17 +86,106 @@ def _normalize_header(value):
         return ""
     return str(value).replace("\ufeff", "").strip().lower()
 
-def load_simulated_sql(sql_path, variable, key_value=None):
+def _ensure_report_data_index(conn, sql_path):
+    """Make sure ReportData can be searched by ReportDataDictionaryIndex.
+
+    Some EnergyPlus versions write eplusout.sql without an index on that
+    column, so every variable lookup scans the whole table. The index is
+    created once (plus ANALYZE of ReportData) and persists in the file for
+    later runs. Files that are not writable, and locked databases, are
+    left as they are.
+    """
+    if not (os.access(sql_path, os.W_OK)
+            and os.access(os.path.dirname(os.path.abspath(sql_path)), os.W_OK)):
+        return
+    try:
+        for row in conn.execute("PRAGMA index_list(ReportData)").fetchall():
+            quoted = '"' + row[1].replace('"', '""') + '"'
+            cols = conn.execute(f"PRAGMA index_info({quoted})").fetchall()
+            if cols and min(cols)[2] == "ReportDataDictionaryIndex":
+                return
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_rd_rdd_time "
+                     "ON ReportData(ReportDataDictionaryIndex, TimeIndex)")
+        conn.execute("ANALYZE ReportData")
+        conn.commit()
+    except sqlite3.Error:
+        conn.rollback()
+
+
+def _series_cache_path(sql_path, variable, key_value):
+    """Cache file for one variable lookup, stored next to the SQL file."""
+    digest = hashlib.blake2b(f"{variable}\0{key_value or ''}".encode("utf-8"),
+                             digest_size=6).hexdigest()
+    return f"{sql_path}.{digest}.series"
+
+
+def _read_series_cache(cache_path, sql_path, sql_stat=None):
+    """Return a cached load_simulated_sql result, or None if stale/missing.
+
+    The cache records the SQL file's size and mtime (ns) when it was
+    written; any rewrite of the SQL file invalidates it.
+    """
+    try:
+        st = sql_stat or os.stat(sql_path)
+        with open(cache_path, "rb") as f:
+            meta = json.loads(f.readline())
+            if meta["sql_mtime_ns"] != st.st_mtime_ns or meta["sql_size"] != st.st_size:
+                return None
+            n = meta["n"]
+            data = _new_series()
+            for col in data:
+                col.fromfile(f, n)
+    except (OSError, ValueError, KeyError, EOFError):
+        return None
+    return data, meta["name"], meta["key"], meta["units"]
+
+
+def _write_series_cache(cache_path, sql_path, result):
+    """Persist a load_simulated_sql result; failures are not fatal.
+
+    The file is written under a per-process temporary name and moved into
+    place, so concurrent writers and interrupted runs never leave a
+    truncated cache behind.
+    """
+    data, name, key, units = result
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        st = os.stat(sql_path)
+        meta = {"sql_mtime_ns": st.st_mtime_ns, "sql_size": st.st_size,
+                "name": name, "key": key, "units": units, "n": len(data[3])}
+        with open(tmp_path, "wb") as f:
+            f.write(json.dumps(meta).encode("utf-8") + b"\n")
+            for col in data:
+                col.tofile(f)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def load_simulated_sql(sql_path, variable, key_value=None, sql_stat=None):
     """Load time-series data from EnergyPlus SQL output.
 
+    Unambiguous lookups are cached next to the SQL file
+    ("<sql>.<hash>.series") so repeated calibrations against the same
+    simulation skip the query; the cache is dropped when the SQL changes.
+
     Args:
         sql_path: Path to eplusout.sql
         variable: Variable name (e.g. "Zone Mean Air Temperature")
         key_value: Optional zone/surface key (e.g. "THERMAL ZONE: SPACE 108")
+        sql_stat: Optional os.stat result for sql_path (see _resolve)
 
     Returns:
-        list of (month, day, hour, value) tuples
+        (months, days, hours, values) columns, variable_name, key, units
     """
+    cache_path = _series_cache_path(sql_path, variable, key_value)
+    cached = _read_series_cache(cache_path, sql_path, sql_stat)
+    if cached is not None:
+        return cached
+
     conn = sqlite3.connect(sql_path)
     cur = conn.cursor()
 
@@ -93,21 +226,41 @@ def load_simulated_sql(sql_path, variable, key_value=None):
     actual_name = matches[0][2]
     units = matches[0][3]
 
-    # Extract time-series
-    cur.execute("""SELECT t.Month, t.Day, t.Hour, rd.Value
+    _ensure_report_data_index(conn, sql_path)
+
+    # Extract time-series. SQLite packs month/day/hour into one integer
+    # key (MMDDHH), so each row crosses into Python as two columns and
+    # sorts on a single expression; the key is split into columns here.
+    # Run-period/environment rows have no Month/Day/Hour (NULL key) and
+    # are skipped, as are NULL values (the typed columns cannot hold
+    # None), so such a series reports "No data rows" below.
+    cur.execute("""SELECT t.Month * 10000 + t.Day * 100 + t.Hour AS tskey,
+        rd.Value
         FROM ReportData rd
         JOIN Time t ON rd.TimeIndex = t.TimeIndex
         WHERE rd.ReportDataDictionaryIndex = ?
         AND t.WarmupFlag IS NULL
-        ORDER BY t.Month, t.Day, t.Hour""", (rdd_idx,))
-    data = cur.fetchall()
+        AND t.Month IS NOT NULL AND t.Day IS NOT NULL AND t.Hour IS NOT NULL
+        AND rd.Value IS NOT NULL
+        ORDER BY tskey""", (rdd_idx,))
+    rows = cur.fetchall()
     conn.close()
 
-    if not data:
+    if not rows:
         print(f"Error: No data rows for {actual_name} [{actual_key}]")
         sys.exit(1)
 
-    return data, actual_name, actual_key, units
+    keys, values = zip(*rows)
+    data = (array(_TS_TYPECODE, [k // 10000 for k in keys]),
+            array(_TS_TYPECODE, [k // 100 % 100 for k in keys]),
+            array(_TS_TYPECODE, [k % 100 for k in keys]),
+            array(_VALUE_TYPECODE, values))
+
+    result = (data, actual_name, actual_key, units)
+    # Ambiguous lookups print a warning above, so they are not cached.
+    if len(matches) == 1 or key_value:
+        _write_series_cache(cache_path, sql_path, result)
+    return result
 
 
 def load_simulated_csv(csv_path, column=None):
@@ -118,67 +271,69 @@ def load_simulated_csv(csv_path, column=None):
     "ZONE:Variable Name [Units](Frequency)"
 
     Returns:
-        list of (month, day, hour, value) tuples, variable_name, units
+        (months, days, hours, values) columns, variable_name, key, units
     """
+    data = _new_series()
     with open(csv_path, "r", encoding="utf-8-sig", errors="replace") as f:
         reader = csv.reader(f)
-        headers = next(reader)
 
-    # Clean headers
-    headers = [h.strip() for h in headers]
+        # Clean headers
+        headers = [h.strip() for h in next(reader)]
 
-    # Find the data column
-    col_idx = None
-    var_name = ""
+        # Find the data column
+        col_idx = None
+        var_name = ""
 
-    if column:
-        # Try exact match first, then partial
-        for i, h in enumerate(headers):
-            if column.lower() == h.lower():
-                col_idx = i
-                var_name = h
-                break
-        if col_idx is None:
+        if column:
+            # Try exact match first, then partial
             for i, h in enumerate(headers):
-                if column.lower() in h.lower():
+                if column.lower() == h.lower():
                     col_idx = i
                     var_name = h
                     break
-    else:
-        # Use first non-time column
-        if len(headers) > 1:
-            col_idx = 1
-            var_name = headers[1]
-
-    if col_idx is None:
-        print(f"Error: Column '{column}' not found in CSV")
-        print(f"  Available columns: {headers}")
-        sys.exit(1)
-
-    # Parse units from header (e.g. "...Zone Mean Air Temperature [C](Hourly)")
-    units = ""
-    m = re.search(r'\[([^\]]+)\]', var_name)
-    if m:
-        units = m.group(1)
+            if col_idx is None:
+                for i, h in enumerate(headers):
+                    if column.lower() in h.lower():
+                        col_idx = i
+                        var_name = h
+                        break
+        else:
+            # Use first non-time column
+            if len(headers) > 1:
+                col_idx = 1
+                var_name = headers[1]
 
-    # Read data
-    data = []
-    with open(csv_path, "r", encoding="utf-8-sig", errors="replace") as f:
-        reader = csv.reader(f)
-        next(reader)  # skip header
+        if col_idx is None:
+            print(f"Error: Column '{column}' not found in CSV")
+            print(f"  Available columns: {headers}")
+            sys.exit(1)
+
+        # Parse units from header (e.g. "...Zone Mean Air Temperature [C](Hourly)")
+        units = ""
+        m = _UNITS_RE.search(var_name)
+        if m:
+            units = m.group(1)
+
+        # Read data (continues after the header row on the same handle).
+        # Hot callables are bound to locals once; this loop runs per row.
+        parse_dt = _parse_ep_datetime_fixed
+        add_month, add_day, add_hour, add_value = (c.append for c in data)
         for row in reader:
             if len(row) <= col_idx:
                 continue
             # Parse date/time from first column
             dt_str = row[0].strip()
-            month, day, hour = _parse_ep_datetime(dt_str)
+            month, day, hour = parse_dt(dt_str)
             if month is None:
                 continue
             try:
-                val = float(row[col_idx].strip())
+                val = float(row[col_idx])
             except (ValueError, IndexError):
                 continue
-            data.append((month, day, hour, val))
+            add_month(month)
+            add_day(day)
+            add_hour(hour)
+            add_value(val)
 
     return data, var_name, "", units
 
@@ -189,12 +344,27 @@ def _parse_ep_datetime(dt_str):
     Returns (month, day, hour) or (None, None, None) on failure.
     """
     # Match patterns: "MM/DD  HH:MM:SS" or "MM/DD HH:MM"
-    m = re.match(r'\s*(\d{1,2})/(\d{1,2})\s+(\d{1,2}):', dt_str)
+    m = _EP_DT_RE.match(dt_str)
     if m:
         return int(m.group(1)), int(m.group(2)), int(m.group(3))
     return None, None, None
 
 
+def _parse_ep_datetime_fixed(dt_str):
+    """Parse the fixed-width EnergyPlus stamp 'MM/DD  HH:MM:SS' by position.
+
+    EnergyPlus CSVs always write this layout, so slicing skips the regex
+    engine for nearly every row. Anything else falls back to
+    _parse_ep_datetime.
+    """
+    if dt_str[2:3] == "/" and dt_str[5:7] == "  " and dt_str[9:10] == ":":
+        try:
+            return int(dt_str[0:2]), int(dt_str[3:5]), int(dt_str[7:9])
+        except ValueError:
+            pass
+    return _parse_ep_datetime(dt_str)
+
+
 def load_measured_csv(csv_path, column=None):
     """Load measured data from user CSV.
 
@@ -203,93 +373,90 @@ def load_measured_csv(csv_path, column=None):
     2. DateTime,<value_column>  (ISO datetime or similar)
 
     Returns:
-        list of (month, day, hour, value) tuples
+        (months, days, hours, values) columns, value_column_name
     """
+    data = _new_series()
     with open(csv_path, "r", encoding="utf-8-sig", errors="replace") as f:
         reader = csv.reader(f)
         headers = next(reader)
 
-    headers_lower = [_normalize_header(h) for h in headers]
-    headers_clean = [h.replace("\ufeff", "").strip() for h in headers]
-
-    # Find time columns
-    month_col = day_col = hour_col = dt_col = None
-    for i, h in enumerate(headers_lower):
-        if h == "month":
-            month_col = i
-        elif h == "day":
-            day_col = i
-        elif h == "hour":
-            hour_col = i
-        elif h in (
-            "datetime",
-            "date_time",
-            "timestamp",
-            "date/time",
-            "date time",
-            "date",
-            "time",
-            "data",
-        ):
-            dt_col = i
-
-    has_mdy = month_col is not None and day_col is not None and hour_col is not None
-
-    if not has_mdy and dt_col is None:
-        print("Error: Measured CSV must have either Month/Day/Hour columns "
-              "or a DateTime column")
-        print(f"  Found columns: {headers_clean}")
-        sys.exit(1)
-
-    # Find value column
-    val_col = None
-    if column:
-        target = _normalize_header(column)
+        headers_lower = [_normalize_header(h) for h in headers]
+        headers_clean = [h.replace("\ufeff", "").strip() for h in headers]
+        # Exact-name lookups; the last column wins for duplicate names.
+        header_to_idx = {}
         for i, h in enumerate(headers_lower):
-            if target == h:
-                val_col = i
-                break
-        if val_col is None:
-            for i, h in enumerate(headers_lower):
-                if target in h:
+            header_to_idx[h] = i
+
+        # Find time columns (the right-most date/time alias is used)
+        month_col = header_to_idx.get("month")
+        day_col = header_to_idx.get("day")
+        hour_col = header_to_idx.get("hour")
+        dt_cols = [header_to_idx[name] for name in _DATETIME_HEADERS
+                   if name in header_to_idx]
+        dt_col = max(dt_cols) if dt_cols else None
+
+        has_mdy = month_col is not None and day_col is not None and hour_col is not None
+
+        if not has_mdy and dt_col is None:
+            print("Error: Measured CSV must have either Month/Day/Hour columns "
+                  "or a DateTime column")
+            print(f"  Found columns: {headers_clean}")
+            sys.exit(1)
+
+        # Find value column
+        val_col = None
+        if column:
+            target = _normalize_header(column)
+            if target in header_to_idx:
+                val_col = headers_lower.index(target)  # first exact match
+            else:
+                for i, h in enumerate(headers_lower):
+                    if target in h:
+                        val_col = i
+                        break
+        else:
+            # Use the last column that isn't a time column
+            time_cols = {month_col, day_col, hour_col, dt_col}
+            for i in range(len(headers) - 1, -1, -1):
+                if i not in time_cols:
                     val_col = i
                     break
-    else:
-        # Use the last column that isn't a time column
-        time_cols = {month_col, day_col, hour_col, dt_col}
-        for i in range(len(headers) - 1, -1, -1):
-            if i not in time_cols:
-                val_col = i
-                break
-
-    if val_col is None:
-        print(f"Error: Value column '{column}' not found in measured CSV")
-        print(f"  Available columns: {headers_clean}")
-        sys.exit(1)
 
-    # Read data
-    data = []
-    with open(csv_path, "r", encoding="utf-8-sig", errors="replace") as f:
-        reader = csv.reader(f)
-        next(reader)  # skip header
+        if val_col is None:
+            print(f"Error: Value column '{column}' not found in measured CSV")
+            print(f"  Available columns: {headers_clean}")
+            sys.exit(1)
+
+        # Read data (continues after the header row on the same handle).
+        # Hot callables are bound to locals once; this loop runs per row.
+        parse_dt = _parse_datetime
+        add_month, add_day, add_hour, add_value = (c.append for c in data)
         for row in reader:
             if not row or not row[0].strip():
                 continue
             try:
                 if has_mdy:
-                    month = int(row[month_col].strip())
-                    day = int(row[day_col].strip())
-                    hour = int(row[hour_col].strip())
+                    month = int(row[month_col])
+                    day = int(row[day_col])
+                    hour = int(row[hour_col])
+                    # Outside the byte range cannot match a simulated
+                    # timestamp; skip rather than overflow the column.
+                    if not (0 <= month < 128 and 0 <= day < 128
+                            and 0 <= hour < 128):
+                        continue
                 else:
                     # Parse datetime
                     dt_str = row[dt_col].strip()
-                    month, day, hour = _parse_datetime(dt_str)
+                    month, day, hour = parse_dt(dt_str)
                     if month is None:
                         continue
-                val = float(row[val_col].strip())
-                data.append((month, day, hour, val))
+                val = float(row[val_col])
             except (ValueError, IndexError):
                 continue
+            add_month(month)
+            add_day(day)
+            add_hour(hour)
+            add_value(val)
 
     return data, headers_clean[val_col]
 
@@ -297,15 +464,15 @@ def load_measured_csv(csv_path, column=None):
 def _parse_datetime(dt_str):
     """Parse various datetime formats. Returns (month, day, hour)."""
     # ISO: 2024-01-15T14:00:00 or 2024-01-15 14:00
-    m = re.match(r'(\d{4})-(\d{1,2})-(\d{1,2})[T\s](\d{1,2})', dt_str)
+    m = _ISO_DT_RE.match(dt_str)
     if m:
         return int(m.group(2)), int(m.group(3)), int(m.group(4))
     # US: 01/15/2024 14:00
-    m = re.match(r'(\d{1,2})/(\d{1,2})/\d{2,4}\s+(\d{1,2})', dt_str)
+    m = _US_DT_RE.match(dt_str)
     if m:
         return int(m.group(1)), int(m.group(2)), int(m.group(3))
     # EP-style (month/day without year): 05/19  01:00:00
-    m = re.match(r'\s*(\d{1,2})/(\d{1,2})\s+(\d{1,2}):', dt_str)
+    m = _EP_DT_RE.match(dt_str)
     if m:
         return int(m.group(1)), int(m.group(2)), int(m.group(3))
     return None, None, None
@@ -318,25 +485,30 @@ def _parse_datetime(dt_str):
 def align_data(sim_data, meas_data):
     """Align simulation and measured data by (month, day, hour) timestamp.
 
+    Args:
+        sim_data, meas_data: (months, days, hours, values) columns
+
     Returns:
         sim_values: list of float
         meas_values: list of float
         timestamps: list of (month, day, hour) tuples
     """
     # Build lookup from measured data
-    meas_map = {}
-    for m, d, h, v in meas_data:
-        meas_map[(m, d, h)] = v
+    meas_months, meas_days, meas_hours, meas_vals = meas_data
+    meas_map = dict(zip(zip(meas_months, meas_days, meas_hours), meas_vals))
+    lookup = meas_map.get
 
+    sim_months, sim_days, sim_hours, sim_vals = sim_data
     sim_values = []
     meas_values = []
     timestamps = []
 
-    for m, d, h, v in sim_data:
-        key = (m, d, h)
-        if key in meas_map:
+    # One hash probe per simulated row (get) instead of `in` + `[]`
+    for key, v in zip(zip(sim_months, sim_days, sim_hours), sim_vals):
+        mv = lookup(key)
+        if mv is not None:
             sim_values.append(v)
-            meas_values.append(meas_map[key])
+            meas_values.append(mv)
             timestamps.append(key)
 
     return sim_values, meas_values, timestamps
@@ -364,15 +536,15 @@ def calc_metrics(sim, meas):
     mean_meas = sum(meas) / n
     mean_sim = sum(sim) / n
 
-    # Differences
-    diffs = [s - m for s, m in zip(sim, meas)]
+    # Differences (map + operator keep the element loop in C)
+    diffs = list(map(operator.sub, sim, meas))
 
     # MBE
     mbe = sum(diffs) / n
 
     # RMSE
-    sq_diffs = [d * d for d in diffs]
-    rmse = math.sqrt(sum(sq_diffs) / n)
+    ss_res = sum(map(operator.mul, diffs, diffs))
+    rmse = math.sqrt(ss_res / n)
 
     # CV(RMSE) and NMBE
     if abs(mean_meas) < 1e-10:
@@ -382,18 +554,21 @@ def calc_metrics(sim, meas):
         cv_rmse = (rmse / abs(mean_meas)) * 100
         nmbe = (mbe / abs(mean_meas)) * 100
 
-    # R-squared
-    ss_res = sum(sq_diffs)
-    ss_tot = sum((m - mean_meas) ** 2 for m in meas)
+    # R-squared. Deviations are summed explicitly: the one-pass identity
+    # sum(m^2) - n*mean^2 cancels badly when the variance is small next to
+    # the mean (e.g. near-constant measurements), which is exactly where
+    # the ss_tot guard below has to be reliable.
+    deviations = [m - mean_meas for m in meas]
+    ss_tot = sum(map(operator.mul, deviations, deviations))
     if ss_tot < 1e-10:
         r2 = float('nan')
     else:
         r2 = 1 - (ss_res / ss_tot)
 
-    # Max deviation
-    abs_diffs = [abs(d) for d in diffs]
-    max_dev_idx = abs_diffs.index(max(abs_diffs))
-    max_dev = diffs[max_dev_idx]
+    # Max deviation: max(key=abs) keeps the first of any ties, as the old
+    # abs-list search did, and index() then finds that same object.
+    max_dev = max(diffs, key=abs)
+    max_dev_idx = diffs.index(max_dev)
 
     return {
         "n": n,
@@ -419,6 +594,13 @@ def format_timestamp(ts):
     return f"{m}/{d} {h:02d}:00"
 
 
+def format_series_range(data):
+    """Format the first and last timestamps of a loaded series."""
+    months, days, hours, _ = data
+    return (f"({months[0]}/{days[0]} H{hours[0]})"
+            f" - ({months[-1]}/{days[-1]} H{hours[-1]})")
+
+
 def print_report(metrics, variable, timestamps, units="", granularity="hourly"):
     """Print formatted calibration report."""
     n = metrics["n"]
@@ -481,6 +663,7 @@ def generate_chart(sim, meas, timestamps, variable, units, output_path):
         import matplotlib
         matplotlib.use("Agg")
         import matplotlib.pyplot as plt
+        from matplotlib.collections import PolyCollection
     except ImportError:
         print("  Warning: matplotlib not available, skipping chart")
         return
@@ -509,10 +692,19 @@ def generate_chart(sim, meas, timestamps, variable, units, output_path):
 
     # --- Bottom: Residuals ---
     ax2 = axes[1]
-    residuals = [s - m for s, m in zip(sim, meas)]
-    colors = ["#4CAF50" if abs(r) <= 2 else "#FFC107" if abs(r) <= 5
-              else "#F44336" for r in residuals]
-    ax2.bar(x, residuals, color=colors, width=1, edgecolor="none", alpha=0.7)
+    # One PolyCollection per colour band rather than a Rectangle artist
+    # per bar; same unit-width bars as ax.bar(width=1).
+    bands = {"#4CAF50": [], "#FFC107": [], "#F44336": []}
+    for i, (s, m) in enumerate(zip(sim, meas)):
+        r = s - m
+        a = abs(r)
+        color = "#4CAF50" if a <= 2 else "#FFC107" if a <= 5 else "#F44336"
+        bands[color].append(((i - 0.5, 0), (i - 0.5, r), (i + 0.5, r), (i + 0.5, 0)))
+    for color, verts in bands.items():
+        if verts:
+            ax2.add_collection(PolyCollection(
+                verts, facecolors=color, edgecolors="none", alpha=0.7))
+    ax2.autoscale_view()
     ax2.axhline(y=0, color="black", linewidth=0.5)
     ax2.set_ylabel(f"Residual{unit_str}", fontsize=10)
     ax2.set_xlabel("Time", fontsize=10)
@@ -530,6 +722,63 @@ def generate_chart(sim, meas, timestamps, variable, units, output_path):
 # Commands
 # ---------------------------------------------------------------------------
 
+def _resolve(path, label):
+    """Return (absolute path, os.stat result), exiting if the file is missing."""
+    path = os.path.abspath(path)
+    try:
+        st = os.stat(path)
+    except OSError:
+        print(f"Error: {label} not found: {path}")
+        sys.exit(1)
+    return path, st
+
+
+def _run_tracker_subprocess(tracker_script, tracker_args):
+    """Run calibration_tracker.py in a child interpreter.
+
+    Returns (returncode, stdout, stderr).
+    """
+    proc = subprocess.run(
+        [sys.executable, tracker_script] + tracker_args,
+        capture_output=True,
+        text=True,
+    )
+    return proc.returncode, proc.stdout, proc.stderr
+
+
+def _run_tracker_in_process(tracker_script, tracker_args):
+    """Run calibration_tracker.main() in this interpreter.
+
+    Skips a second interpreter start-up per iteration. Output and exit
+    status are captured so the caller sees the same
+    (returncode, stdout, stderr) as from _run_tracker_subprocess.
+    """
+    tracker = sys.modules.get("calibration_tracker")
+    if tracker is None:
+        spec = importlib.util.spec_from_file_location(
+            "calibration_tracker", tracker_script)
+        tracker = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(tracker)
+        sys.modules["calibration_tracker"] = tracker
+
+    out = io.StringIO()
+    err = io.StringIO()
+    returncode = 0
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+        try:
+            tracker.main(tracker_args)
+        except SystemExit as exc:
+            if exc.code is None or isinstance(exc.code, int):
+                returncode = exc.code or 0
+            else:
+                print(exc.code, file=sys.stderr)
+                returncode = 1
+        except Exception:
+            traceback.print_exc()
+            returncode = 1
+    return returncode, out.getvalue(), err.getvalue()
+
+
 def _maybe_record_iteration(args):
     """Auto-record calibration iteration when tracking options are provided."""
     if not getattr(args, "record_dir", None):
@@ -556,8 +805,6 @@ def _maybe_record_iteration(args):
         sys.exit(1)
 
     cmd = [
-        sys.executable,
-        tracker_script,
         "record",
         "--run-dir",
         args.record_dir,
@@ -597,22 +844,21 @@ def _maybe_record_iteration(args):
     if getattr(args, "record_note", None):
         cmd.extend(["--note", args.record_note])
 
-    proc = subprocess.run(
-        cmd,
-        capture_output=True,
-        text=True,
-    )
-    if proc.returncode != 0:
+    if getattr(args, "tracker_subprocess", False):
+        returncode, stdout, stderr = _run_tracker_subprocess(tracker_script, cmd)
+    else:
+        returncode, stdout, stderr = _run_tracker_in_process(tracker_script, cmd)
+    if returncode != 0:
         print("Error: Failed to auto-record calibration iteration")
-        if proc.stdout.strip():
-            print(proc.stdout.strip())
-        if proc.stderr.strip():
-            print(proc.stderr.strip())
-        sys.exit(proc.returncode)
+        if stdout.strip():
+            print(stdout.strip())
+        if stderr.strip():
+            print(stderr.strip())
+        sys.exit(returncode)
 
-    if proc.stdout.strip():
+    if stdout.strip():
         print("\n--- Tracking ---")
-        print(proc.stdout.strip())
+        print(stdout.strip())
 
 
 def _add_tracking_args(parser):
@@ -641,27 +887,23 @@ def _add_tracking_args(parser):
                         help="Optional IDF snapshot filename tag")
     parser.add_argument("--record-note",
                         help="Free-text note saved in iteration log")
+    parser.add_argument("--tracker-subprocess", action="store_true",
+                        help="Run the tracker in a separate Python process "
+                             "instead of in-process")
 
 
 def cmd_compare(args):
     """Compare simulation results against measured data."""
-    sim_path = os.path.abspath(args.simulated)
-    meas_path = os.path.abspath(args.measured)
+    sim_path, sim_stat = _resolve(args.simulated, "Simulated data")
+    meas_path, _ = _resolve(args.measured, "Measured data")
     output_dir = os.path.abspath(args.output_dir)
 
-    if not os.path.exists(sim_path):
-        print(f"Error: Simulated data not found: {sim_path}")
-        sys.exit(1)
-    if not os.path.exists(meas_path):
-        print(f"Error: Measured data not found: {meas_path}")
-        sys.exit(1)
-
     os.makedirs(output_dir, exist_ok=True)
 
     # Load simulation data
     if sim_path.lower().endswith(".sql"):
         sim_data, var_name, key_val, units = load_simulated_sql(
-            sim_path, args.variable, args.key_value)
+            sim_path, args.variable, args.key_value, sim_stat)
     else:
         sim_data, var_name, key_val, units = load_simulated_csv(
             sim_path, args.sim_column)
@@ -669,10 +911,10 @@ def cmd_compare(args):
     # Load measured data
     meas_data, meas_col = load_measured_csv(meas_path, args.meas_column)
 
-    if not sim_data:
+    if not sim_data[3]:
         print("Error: No simulation data loaded")
         sys.exit(1)
-    if not meas_data:
+    if not meas_data[3]:
         print("Error: No measured data loaded")
         sys.exit(1)
 
@@ -681,10 +923,8 @@ def cmd_compare(args):
 
     if not sim_values:
         print("Error: No overlapping timestamps between simulation and measured data")
-        print(f"  Simulation range: ({sim_data[0][0]}/{sim_data[0][1]} H{sim_data[0][2]})"
-              f" - ({sim_data[-1][0]}/{sim_data[-1][1]} H{sim_data[-1][2]})")
-        print(f"  Measured range:   ({meas_data[0][0]}/{meas_data[0][1]} H{meas_data[0][2]})"
-              f" - ({meas_data[-1][0]}/{meas_data[-1][1]} H{meas_data[-1][2]})")
+        print(f"  Simulation range: {format_series_range(sim_data)}")
+        print(f"  Measured range:   {format_series_range(meas_data)}")
         sys.exit(1)
 
     # Calculate metrics
@@ -698,9 +938,10 @@ def cmd_compare(args):
     with open(comp_csv, "w", encoding="utf-8", newline="") as f:
         writer = csv.writer(f)
         writer.writerow(["Month", "Day", "Hour", "Simulated", "Measured", "Difference"])
-        for ts, sv, mv in zip(timestamps, sim_values, meas_values):
-            writer.writerow([ts[0], ts[1], ts[2], f"{sv:.4f}", f"{mv:.4f}",
-                            f"{sv - mv:.4f}"])
+        writer.writerows(
+            (m, d, h, f"{sv:.4f}", f"{mv:.4f}", f"{sv - mv:.4f}")
+            for (m, d, h), sv, mv in zip(timestamps, sim_values, meas_values)
+        )
     print(f"\n  Comparison CSV: {comp_csv}")
 
     # Generate chart
@@ -713,20 +954,13 @@ def cmd_compare(args):
 
 def cmd_metrics(args):
     """Calculate and print error metrics only (no chart)."""
-    sim_path = os.path.abspath(args.simulated)
-    meas_path = os.path.abspath(args.measured)
-
-    if not os.path.exists(sim_path):
-        print(f"Error: Simulated data not found: {sim_path}")
-        sys.exit(1)
-    if not os.path.exists(meas_path):
-        print(f"Error: Measured data not found: {meas_path}")
-        sys.exit(1)
+    sim_path, sim_stat = _resolve(args.simulated, "Simulated data")
+    meas_path, _ = _resolve(args.measured, "Measured data")
 
     # Load data
     if sim_path.lower().endswith(".sql"):
         sim_data, var_name, key_val, units = load_simulated_sql(
-            sim_path, args.variable, args.key_value)
+            sim_path, args.variable, args.key_value, sim_stat)
     else:
         sim_data, var_name, key_val, units = load_simulated_csv(
             sim_path, args.sim_column)
@@ -740,6 +974,103 @@ def cmd_metrics(args):
     _maybe_record_iteration(args)
 
 
+def _compare_worker(job):
+    """Run cmd_compare for one variable; returns (returncode, output).
+
+    Runs in a worker process, so it opens its own SQLite connection and
+    captures its report instead of interleaving it with other workers.
+    """
+    out = io.StringIO()
+    returncode = 0
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(out):
+        try:
+            cmd_compare(argparse.Namespace(**job))
+        except SystemExit as exc:
+            if exc.code is None or isinstance(exc.code, int):
+                returncode = exc.code or 0
+            else:
+                print(exc.code)
+                returncode = 1
+        except Exception:
+            traceback.print_exc()
+            returncode = 1
+    return returncode, out.getvalue()
+
+
+def _positive_int(value):
+    """argparse type for counts that must be at least 1."""
+    try:
+        n = int(value)
+    except ValueError:
+        n = 0
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer: {value!r}")
+    return n
+
+
+def cmd_compare_multi(args):
+    """Compare several variables in parallel, one output subdirectory each."""
+    sim_path, _ = _resolve(args.simulated, "Simulated data")
+    meas_path, _ = _resolve(args.measured, "Measured data")
+    output_dir = os.path.abspath(args.output_dir)
+
+    variables = [v.strip() for v in args.variables.split(",") if v.strip()]
+    if not variables:
+        print("Error: --variables must list at least one variable")
+        sys.exit(1)
+    meas_columns = [None] * len(variables)
+    if args.meas_columns:
+        meas_columns = [c.strip() for c in args.meas_columns.split(",") if c.strip()]
+        if len(meas_columns) != len(variables):
+            print(f"Error: --meas-columns has {len(meas_columns)} entries, "
+                  f"--variables has {len(variables)}")
+            sys.exit(1)
+
+    is_sql = sim_path.lower().endswith(".sql")
+    if is_sql:
+        # Index once up front so workers don't race to create it.
+        conn = sqlite3.connect(sim_path)
+        _ensure_report_data_index(conn, sim_path)
+        conn.close()
+
+    jobs = []
+    used_dirs = set()
+    for variable, meas_column in zip(variables, meas_columns):
+        subdir = re.sub(r"[^A-Za-z0-9._-]+", "_", variable).strip("_") or "variable"
+        base, n = subdir, 2
+        while subdir in used_dirs:
+            subdir = f"{base}_{n}"
+            n += 1
+        used_dirs.add(subdir)
+        jobs.append({
+            "simulated": sim_path,
+            "measured": meas_path,
+            "variable": variable,
+            "output_dir": os.path.join(output_dir, subdir),
+            # For CSV sources the variable names the simulation column
+            "sim_column": None if is_sql else variable,
+            "meas_column": meas_column,
+            "key_value": args.key_value,
+        })
+
+    max_workers = args.jobs or min(len(jobs), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        results = list(pool.map(_compare_worker, jobs))
+
+    failed = []
+    for job, (returncode, output) in zip(jobs, results):
+        print(f"\n##### {job['variable']} -> {job['output_dir']}")
+        if output.strip():
+            print(output.rstrip())
+        if returncode != 0:
+            failed.append(job["variable"])
+
+    print(f"\n{len(jobs) - len(failed)}/{len(jobs)} variables compared")
+    if failed:
+        print(f"Error: Comparison failed for: {', '.join(failed)}")
+        sys.exit(1)
+
+
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
@@ -786,6 +1117,28 @@ def main():
                        help="Zone/key value filter (for SQL source)")
     _add_tracking_args(p_met)
 
+    # compare-multi
+    p_multi = subparsers.add_parser(
+        "compare-multi",
+        help="Compare several variables in parallel processes")
+    p_multi.add_argument("--simulated", required=True,
+                         help="Simulation results (CSV or SQL)")
+    p_multi.add_argument("--measured", required=True,
+                         help="Measured data CSV")
+    p_multi.add_argument("--variables", required=True,
+                         help="Comma-separated variable names (SQL) or "
+                              "simulation column names (CSV)")
+    p_multi.add_argument("--output-dir", required=True,
+                         help="Output directory; one subdirectory per variable")
+    p_multi.add_argument("--meas-columns",
+                         help="Comma-separated measured CSV columns, "
+                              "one per variable")
+    p_multi.add_argument("--key-value",
+                         help="Zone/key value filter (for SQL source)")
+    p_multi.add_argument("--jobs", type=_positive_int,
+                         help="Worker processes (default: one per variable, "
+                              "up to the CPU count)")
+
     args = parser.parse_args()
     if args.command is None:
         parser.print_help()
@@ -794,6 +1147,7 @@ def main():
     commands = {
         "compare": cmd_compare,
         "metrics": cmd_metrics,
+        "compare-multi": cmd_compare_multi,
     }
     commands[args.command](args)
 
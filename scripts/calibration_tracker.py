@@ -18,15 +18,12 @@ import argparse
 import csv
 import datetime as dt
 import json
-import math
 import os
 import shutil
 import sys
 
-import calibration
 
-
-CSV_FIELDS = [
+CSV_FIELDS = (
     "run_id",
     "iteration",
     "timestamp",
@@ -50,7 +47,31 @@ CSV_FIELDS = [
     "pass_ashrae14",
     "granularity",
     "note",
-]
+)
+
+# Log rows are handled positionally, in CSV_FIELDS order.
+_COL_RUN_ID = CSV_FIELDS.index("run_id")
+_COL_ITERATION = CSV_FIELDS.index("iteration")
+_COL_IDF_VERSION = CSV_FIELDS.index("idf_version")
+_COL_CV_RMSE = CSV_FIELDS.index("cv_rmse")
+_COL_NMBE = CSV_FIELDS.index("nmbe")
+_COL_DELTA_CV = CSV_FIELDS.index("delta_cv_rmse_vs_prev")
+_COL_DELTA_NMBE = CSV_FIELDS.index("delta_nmbe_vs_prev")
+_COL_PASS = CSV_FIELDS.index("pass_ashrae14")
+
+# json.dumps() builds a new JSONEncoder whenever it is given options;
+# these are built once and reused for every payload and log line.
+_JSON_COMPACT = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+_JSON_LINE = json.JSONEncoder(ensure_ascii=False)
+_JSON_PRETTY = json.JSONEncoder(ensure_ascii=False, indent=2)
+
+# Log files are rewritten whole; a large buffer turns that into a handful
+# of write syscalls instead of one per 8 KiB.
+_IO_BUFFER_SIZE = 1 << 16
+
+# Bumped whenever the layout of iteration_log.index.json changes; an index
+# written by another version is ignored and rebuilt.
+_LOG_INDEX_FORMAT = 2
 
 
 def _now_iso():
@@ -61,24 +82,51 @@ def _abs_path(path):
     return os.path.abspath(path)
 
 
+def _stat_required(path, label):
+    """Return os.stat(path), or print "<label> not found" and exit."""
+    try:
+        return os.stat(path)
+    except OSError:
+        print(f"Error: {label} not found: {path}")
+        sys.exit(1)
+
+
 def _ensure_dir(path):
     os.makedirs(path, exist_ok=True)
 
 
-def _slugify(value):
-    out = []
-    for ch in str(value):
+class _SlugTable(dict):
+    """str.translate table for _slugify, filled in per code point on demand.
+
+    Letters and digits (any script) map to their lowercase form, "-" and
+    "_" are kept, everything else becomes "_".
+    """
+
+    def __missing__(self, codepoint):
+        ch = chr(codepoint)
         if ch.isalnum():
-            out.append(ch.lower())
+            out = ch.lower()
         elif ch in ("-", "_"):
-            out.append(ch)
+            out = ch
         else:
-            out.append("_")
-    text = "".join(out).strip("_")
+            out = "_"
+        self[codepoint] = out
+        return out
+
+
+_SLUG_TABLE = _SlugTable()
+
+
+def _slugify(value):
+    text = str(value).translate(_SLUG_TABLE).strip("_")
     return text or "version"
 
 
 def _safe_float(value):
+    # Empty log cells are common (first-iteration deltas); answer them
+    # without raising and catching a ValueError.
+    if value is None or value == "":
+        return None
     try:
         return float(value)
     except (TypeError, ValueError):
@@ -86,29 +134,128 @@ def _safe_float(value):
 
 
 def _safe_json_dumps(obj):
-    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+    return _JSON_COMPACT.encode(obj)
 
 
 def _read_rows(csv_path):
+    """Read the log as lists of strings in CSV_FIELDS order.
+
+    Columns are mapped from the file's header, so logs with reordered or
+    missing columns still line up; missing values read as "".
+    """
     if not os.path.exists(csv_path):
         return []
-    with open(csv_path, "r", encoding="utf-8-sig", newline="") as f:
-        reader = csv.DictReader(f)
-        return list(reader)
+    width = len(CSV_FIELDS)
+    with open(csv_path, "r", encoding="utf-8-sig", newline="",
+              buffering=_IO_BUFFER_SIZE) as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return []
+        rows = [row for row in reader if row]
+    if tuple(header) == CSV_FIELDS:
+        for row in rows:
+            if len(row) != width:
+                row[:] = (row + [""] * width)[:width]
+        return rows
+    positions = [header.index(name) if name in header else None for name in CSV_FIELDS]
+    return [
+        [row[i] if i is not None and i < len(row) else "" for i in positions]
+        for row in rows
+    ]
 
 
 def _write_rows(csv_path, rows):
-    with open(csv_path, "w", encoding="utf-8", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
-        writer.writeheader()
-        for row in rows:
-            writer.writerow(row)
+    with open(csv_path, "w", encoding="utf-8", newline="",
+              buffering=_IO_BUFFER_SIZE) as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_FIELDS)
+        writer.writerows(rows)
 
 
 def _write_jsonl(jsonl_path, rows):
-    with open(jsonl_path, "w", encoding="utf-8", newline="") as f:
-        for row in rows:
-            f.write(json.dumps(row, ensure_ascii=False) + "\n")
+    encode = _JSON_LINE.encode
+    text = "".join(encode(dict(zip(CSV_FIELDS, row))) + "\n" for row in rows)
+    with open(jsonl_path, "w", encoding="utf-8", newline="",
+              buffering=_IO_BUFFER_SIZE) as f:
+        f.write(text)
+
+
+def _append_log_row(csv_path, jsonl_path, row):
+    with open(csv_path, "a", encoding="utf-8", newline="") as f:
+        csv.writer(f).writerow(row)
+    with open(jsonl_path, "a", encoding="utf-8", newline="") as f:
+        f.write(_JSON_LINE.encode(dict(zip(CSV_FIELDS, row))) + "\n")
+
+
+def _file_signature(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+def _read_log_index(index_path, csv_path, jsonl_path):
+    """Load the log sidecar index if it still matches both log files.
+
+    The index lets cmd_record append to a sorted log without reading it:
+    it holds the largest iteration and, per run, the iteration and
+    cv_rmse/nmbe of the latest row, so its size does not grow with the
+    log. A size/mtime mismatch (an interrupted write, a hand edit, an
+    older tracker) returns None and the caller falls back to a full
+    rewrite.
+    """
+    try:
+        with open(index_path, "r", encoding="utf-8") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if (
+        not isinstance(index, dict)
+        or index.get("format") != _LOG_INDEX_FORMAT
+        or index.get("csv") != _file_signature(csv_path)
+        or index.get("jsonl") != _file_signature(jsonl_path)
+    ):
+        return None
+    return index
+
+
+def _write_log_index(index_path, csv_path, jsonl_path, rows):
+    """Rebuild the sidecar index from the sorted rows just written.
+
+    Only each run's latest row is kept, which is enough to spot a repeated
+    iteration as long as every iteration is written the way cmd_record
+    writes it. A hand-edited log ("05", "", ...) gets no index at all.
+    """
+    runs = {}
+    for r in rows:
+        if r[_COL_ITERATION] != str(_row_sort_key(r)):
+            try:
+                os.remove(index_path)
+            except OSError:
+                pass
+            return
+        runs[r[_COL_RUN_ID]] = {
+            "iteration": r[_COL_ITERATION],
+            "cv_rmse": r[_COL_CV_RMSE],
+            "nmbe": r[_COL_NMBE],
+        }
+    index = {
+        "format": _LOG_INDEX_FORMAT,
+        "max_iteration": _row_sort_key(rows[-1]) if rows else None,
+        "runs": runs,
+    }
+    _update_log_index(index_path, csv_path, jsonl_path, index)
+
+
+def _update_log_index(index_path, csv_path, jsonl_path, index):
+    index["csv"] = _file_signature(csv_path)
+    index["jsonl"] = _file_signature(jsonl_path)
+    tmp_path = index_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(_JSON_LINE.encode(index))
+    os.replace(tmp_path, index_path)
 
 
 def _load_changed_params(args):
@@ -140,20 +287,26 @@ def _is_calibrated(metrics, granularity):
 def _fmt_num(value, digits=6):
     if value is None:
         return ""
-    if isinstance(value, float) and (math.isnan(value) or math.isinf(value)):
+    # x - x is 0.0 only for finite floats, so this covers the usual metric
+    # without separate isnan/isinf calls; nan/inf keep their str() form.
+    if isinstance(value, float) and not value - value == 0:
         return str(value)
     return f"{value:.{digits}f}"
 
 
-def _format_range(timestamps):
-    if not timestamps:
+def _format_range(endpoints):
+    """Format the (first, last) aligned timestamps; ("", "") if there are none."""
+    if not endpoints:
         return "", ""
-    first = calibration.format_timestamp(timestamps[0])
-    last = calibration.format_timestamp(timestamps[-1])
+    import calibration
+
+    first = calibration.format_timestamp(endpoints[0])
+    last = calibration.format_timestamp(endpoints[-1])
     return first, last
 
 
-def _init_run_meta(run_dir, run_id):
+def _init_run_meta(run_dir, run_id, now=None):
+    now = now or _now_iso()
     meta_path = os.path.join(run_dir, "run_meta.json")
     if os.path.exists(meta_path):
         with open(meta_path, "r", encoding="utf-8-sig") as f:
@@ -161,11 +314,11 @@ def _init_run_meta(run_dir, run_id):
     else:
         meta = {
             "run_id": run_id,
-            "created_at": _now_iso(),
+            "created_at": now,
         }
-    meta["updated_at"] = _now_iso()
+    meta["updated_at"] = now
     with open(meta_path, "w", encoding="utf-8") as f:
-        json.dump(meta, f, ensure_ascii=False, indent=2)
+        f.write(_JSON_PRETTY.encode(meta))
 
 
 def _copy_idf_snapshot(idf_path, idf_versions_dir, iteration, idf_version, tag):
@@ -181,19 +334,17 @@ def _copy_idf_snapshot(idf_path, idf_versions_dir, iteration, idf_version, tag):
 
 
 def _load_and_align(args):
+    # Imported here so `summary` and `--help` don't pay for the loaders.
+    import calibration
+
     sim_path = _abs_path(args.simulated)
     meas_path = _abs_path(args.measured)
-
-    if not os.path.exists(sim_path):
-        print(f"Error: Simulated data not found: {sim_path}")
-        sys.exit(1)
-    if not os.path.exists(meas_path):
-        print(f"Error: Measured data not found: {meas_path}")
-        sys.exit(1)
+    sim_stat = _stat_required(sim_path, "Simulated data")
+    _stat_required(meas_path, "Measured data")
 
     if sim_path.lower().endswith(".sql"):
         sim_data, sim_var_name, key_val, units = calibration.load_simulated_sql(
-            sim_path, args.variable, args.key_value
+            sim_path, args.variable, args.key_value, sim_stat
         )
     else:
         sim_data, sim_var_name, key_val, units = calibration.load_simulated_csv(
@@ -205,39 +356,33 @@ def _load_and_align(args):
 
     if not sim_values:
         print("Error: No overlapping timestamps between simulation and measured data")
-        if sim_data and meas_data:
-            print(
-                f"  Simulation range: ({sim_data[0][0]}/{sim_data[0][1]} H{sim_data[0][2]})"
-                f" - ({sim_data[-1][0]}/{sim_data[-1][1]} H{sim_data[-1][2]})"
-            )
-            print(
-                f"  Measured range:   ({meas_data[0][0]}/{meas_data[0][1]} H{meas_data[0][2]})"
-                f" - ({meas_data[-1][0]}/{meas_data[-1][1]} H{meas_data[-1][2]})"
-            )
+        if sim_data[3] and meas_data[3]:
+            print(f"  Simulation range: {calibration.format_series_range(sim_data)}")
+            print(f"  Measured range:   {calibration.format_series_range(meas_data)}")
         sys.exit(1)
 
     metrics = calibration.calc_metrics(sim_values, meas_values)
-    return metrics, timestamps, sim_var_name, key_val, units, sim_path, meas_path
+    # Only the endpoints are reported, so the full timestamp list is not
+    # kept alive past this point.
+    endpoints = (timestamps[0], timestamps[-1])
+    return metrics, endpoints, sim_var_name, key_val, units, sim_path, meas_path
 
 
 def _row_sort_key(row):
     try:
-        return int(row.get("iteration", 0))
+        return int(row[_COL_ITERATION])
     except ValueError:
         return 0
 
 
 def cmd_record(args):
+    now_iso = _now_iso()
     run_dir = _abs_path(args.run_dir)
     run_id = args.run_id or os.path.basename(run_dir.rstrip("\\/")) or "run"
     idf_path = _abs_path(args.idf_path)
     epw_path = _abs_path(args.epw_path)
-    if not os.path.exists(idf_path):
-        print(f"Error: IDF file not found: {idf_path}")
-        sys.exit(1)
-    if not os.path.exists(epw_path):
-        print(f"Error: EPW file not found: {epw_path}")
-        sys.exit(1)
+    _stat_required(idf_path, "IDF file")
+    _stat_required(epw_path, "EPW file")
     if args.iteration < 0:
         print("Error: --iteration must be >= 0")
         sys.exit(1)
@@ -249,10 +394,10 @@ def cmd_record(args):
     _ensure_dir(idf_versions_dir)
     _ensure_dir(metrics_dir)
     _ensure_dir(notes_dir)
-    _init_run_meta(run_dir, run_id)
+    _init_run_meta(run_dir, run_id, now_iso)
 
     changed_params = _load_changed_params(args)
-    metrics, timestamps, sim_var_name, key_val, units, sim_path, meas_path = _load_and_align(args)
+    metrics, endpoints, sim_var_name, key_val, units, sim_path, meas_path = _load_and_align(args)
     pass_flag = _is_calibrated(metrics, args.granularity)
 
     idf_version = args.idf_version or os.path.splitext(os.path.basename(idf_path))[0]
@@ -264,11 +409,11 @@ def cmd_record(args):
         tag=args.tag,
     )
 
-    first_ts, last_ts = _format_range(timestamps)
+    first_ts, last_ts = _format_range(endpoints)
     metrics_payload = {
         "run_id": run_id,
         "iteration": args.iteration,
-        "timestamp": _now_iso(),
+        "timestamp": now_iso,
         "idf_version": idf_version,
         "idf_path": idf_path,
         "idf_snapshot": snapshot_path,
@@ -299,94 +444,129 @@ def cmd_record(args):
     }
     metrics_path = os.path.join(metrics_dir, f"iter_{args.iteration:03d}_metrics.json")
     with open(metrics_path, "w", encoding="utf-8") as f:
-        json.dump(metrics_payload, f, ensure_ascii=False, indent=2)
+        f.write(_JSON_PRETTY.encode(metrics_payload))
 
     note_path = os.path.join(notes_dir, f"iter_{args.iteration:03d}.md")
+    parts = [
+        f"# Iteration {args.iteration}\n\n",
+        f"- run_id: `{run_id}`\n",
+        f"- idf_version: `{idf_version}`\n",
+        f"- idf_snapshot: `{snapshot_path}`\n",
+        f"- simulated: `{sim_path}`\n",
+        f"- measured: `{meas_path}`\n",
+        f"- variable: `{sim_var_name}`\n",
+    ]
+    if key_val:
+        parts.append(f"- key_value: `{key_val}`\n")
+    parts.append(f"- data_points: `{metrics['n']}`\n")
+    parts.append(f"- cv_rmse: `{metrics['cv_rmse']:.4f}`\n")
+    parts.append(f"- nmbe: `{metrics['nmbe']:.4f}`\n")
+    parts.append(f"- pass_ashrae14: `{str(pass_flag).lower()}`\n")
+    if args.note:
+        parts.append(f"- note: {args.note}\n")
+    parts.append("\n## Changed Params\n\n")
+    parts.append("```json\n")
+    parts.append(_JSON_PRETTY.encode(changed_params))
+    parts.append("\n```\n")
     with open(note_path, "w", encoding="utf-8") as f:
-        f.write(f"# Iteration {args.iteration}\n\n")
-        f.write(f"- run_id: `{run_id}`\n")
-        f.write(f"- idf_version: `{idf_version}`\n")
-        f.write(f"- idf_snapshot: `{snapshot_path}`\n")
-        f.write(f"- simulated: `{sim_path}`\n")
-        f.write(f"- measured: `{meas_path}`\n")
-        f.write(f"- variable: `{sim_var_name}`\n")
-        if key_val:
-            f.write(f"- key_value: `{key_val}`\n")
-        f.write(f"- data_points: `{metrics['n']}`\n")
-        f.write(f"- cv_rmse: `{metrics['cv_rmse']:.4f}`\n")
-        f.write(f"- nmbe: `{metrics['nmbe']:.4f}`\n")
-        f.write(f"- pass_ashrae14: `{str(pass_flag).lower()}`\n")
-        if args.note:
-            f.write(f"- note: {args.note}\n")
-        f.write("\n## Changed Params\n\n")
-        f.write("```json\n")
-        f.write(json.dumps(changed_params, ensure_ascii=False, indent=2))
-        f.write("\n```\n")
+        f.write("".join(parts))
 
     csv_path = os.path.join(run_dir, "iteration_log.csv")
-    rows = _read_rows(csv_path)
-    rows = [
-        r
-        for r in rows
-        if not (
-            r.get("run_id") == run_id
-            and str(r.get("iteration", "")) == str(args.iteration)
-        )
-    ]
-    prev_rows = [r for r in rows if r.get("run_id") == run_id]
-    prev_rows.sort(key=_row_sort_key)
-    prev = prev_rows[-1] if prev_rows else None
-    prev_cv = _safe_float(prev.get("cv_rmse")) if prev else None
-    prev_nmbe = _safe_float(prev.get("nmbe")) if prev else None
+    jsonl_path = os.path.join(run_dir, "iteration_log.jsonl")
+    index_path = os.path.join(run_dir, "iteration_log.index.json")
+
+    # Common case: a new iteration at or past the end of a log this tool
+    # wrote. The row can simply be appended; anything else (re-recording an
+    # iteration, going back, an unindexed log) rewrites the sorted log.
+    index = _read_log_index(index_path, csv_path, jsonl_path)
+    run_entry = index["runs"].get(run_id) if index else None
+    iteration_text = str(args.iteration)
+    append_only = (
+        index is not None
+        and (index["max_iteration"] is None or args.iteration >= index["max_iteration"])
+        and not (run_entry and run_entry["iteration"] == iteration_text)
+    )
+    if append_only:
+        rows = None
+        prev = run_entry
+        prev_cv = _safe_float(prev["cv_rmse"]) if prev else None
+        prev_nmbe = _safe_float(prev["nmbe"]) if prev else None
+    else:
+        rows = _read_rows(csv_path)
+        rows = [
+            r
+            for r in rows
+            if not (r[_COL_RUN_ID] == run_id and r[_COL_ITERATION] == iteration_text)
+        ]
+        prev_rows = [r for r in rows if r[_COL_RUN_ID] == run_id]
+        prev_rows.sort(key=_row_sort_key)
+        prev = prev_rows[-1] if prev_rows else None
+        prev_cv = _safe_float(prev[_COL_CV_RMSE]) if prev else None
+        prev_nmbe = _safe_float(prev[_COL_NMBE]) if prev else None
     delta_cv = metrics["cv_rmse"] - prev_cv if prev_cv is not None else None
     delta_nmbe = metrics["nmbe"] - prev_nmbe if prev_nmbe is not None else None
 
-    new_row = {
-        "run_id": run_id,
-        "iteration": str(args.iteration),
-        "timestamp": _now_iso(),
-        "idf_version": idf_version,
-        "idf_path": idf_path,
-        "epw_path": epw_path,
-        "simulated_path": sim_path,
-        "measured_path": meas_path,
-        "variable": sim_var_name,
-        "key_value": key_val or "",
-        "changed_params_json": _safe_json_dumps(changed_params),
-        "n_points": str(metrics["n"]),
-        "rmse": _fmt_num(metrics["rmse"]),
-        "cv_rmse": _fmt_num(metrics["cv_rmse"]),
-        "mbe": _fmt_num(metrics["mbe"]),
-        "nmbe": _fmt_num(metrics["nmbe"]),
-        "r2": _fmt_num(metrics["r2"]),
-        "max_dev": _fmt_num(metrics["max_dev"]),
-        "delta_cv_rmse_vs_prev": _fmt_num(delta_cv),
-        "delta_nmbe_vs_prev": _fmt_num(delta_nmbe),
-        "pass_ashrae14": str(bool(pass_flag)).lower(),
-        "granularity": args.granularity,
-        "note": args.note or "",
-    }
-    rows.append(new_row)
-    rows.sort(key=_row_sort_key)
-    _write_rows(csv_path, rows)
-    _write_jsonl(os.path.join(run_dir, "iteration_log.jsonl"), rows)
-
-    print("=== Calibration Iteration Recorded ===")
-    print(f"  Run dir:     {run_dir}")
-    print(f"  Run id:      {run_id}")
-    print(f"  Iteration:   {args.iteration}")
-    print(f"  IDF version: {idf_version}")
-    print(f"  Points:      {metrics['n']}")
-    print(f"  CV(RMSE):    {metrics['cv_rmse']:.4f}%")
-    print(f"  NMBE:        {metrics['nmbe']:.4f}%")
-    print(f"  PASS:        {str(pass_flag).lower()}")
+    # One value per CSV_FIELDS entry, in the same order.
+    new_row = (
+        run_id,
+        iteration_text,
+        now_iso,
+        idf_version,
+        idf_path,
+        epw_path,
+        sim_path,
+        meas_path,
+        sim_var_name,
+        key_val or "",
+        _safe_json_dumps(changed_params),
+        str(metrics["n"]),
+        _fmt_num(metrics["rmse"]),
+        _fmt_num(metrics["cv_rmse"]),
+        _fmt_num(metrics["mbe"]),
+        _fmt_num(metrics["nmbe"]),
+        _fmt_num(metrics["r2"]),
+        _fmt_num(metrics["max_dev"]),
+        _fmt_num(delta_cv),
+        _fmt_num(delta_nmbe),
+        str(bool(pass_flag)).lower(),
+        args.granularity,
+        args.note or "",
+    )
+    if append_only:
+        _append_log_row(csv_path, jsonl_path, new_row)
+        index["runs"][run_id] = {
+            "iteration": iteration_text,
+            "cv_rmse": new_row[_COL_CV_RMSE],
+            "nmbe": new_row[_COL_NMBE],
+        }
+        index["max_iteration"] = args.iteration
+        _update_log_index(index_path, csv_path, jsonl_path, index)
+    else:
+        rows.append(new_row)
+        rows.sort(key=_row_sort_key)
+        _write_rows(csv_path, rows)
+        _write_jsonl(jsonl_path, rows)
+        _write_log_index(index_path, csv_path, jsonl_path, rows)
+
+    lines = [
+        "=== Calibration Iteration Recorded ===",
+        f"  Run dir:     {run_dir}",
+        f"  Run id:      {run_id}",
+        f"  Iteration:   {args.iteration}",
+        f"  IDF version: {idf_version}",
+        f"  Points:      {metrics['n']}",
+        f"  CV(RMSE):    {metrics['cv_rmse']:.4f}%",
+        f"  NMBE:        {metrics['nmbe']:.4f}%",
+        f"  PASS:        {str(pass_flag).lower()}",
+    ]
     if delta_cv is not None:
-        print(f"  Delta CV:    {delta_cv:+.4f}")
+        lines.append(f"  Delta CV:    {delta_cv:+.4f}")
     if delta_nmbe is not None:
-        print(f"  Delta NMBE:  {delta_nmbe:+.4f}")
-    print(f"  Snapshot:    {snapshot_path}")
-    print(f"  Metrics:     {metrics_path}")
-    print(f"  Note:        {note_path}")
+        lines.append(f"  Delta NMBE:  {delta_nmbe:+.4f}")
+    lines.append(f"  Snapshot:    {snapshot_path}")
+    lines.append(f"  Metrics:     {metrics_path}")
+    lines.append(f"  Note:        {note_path}")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def cmd_summary(args):
@@ -398,34 +578,45 @@ def cmd_summary(args):
         sys.exit(1)
     rows.sort(key=_row_sort_key)
 
-    print("=== Calibration Run Summary ===")
-    print(f"  Run dir: {run_dir}")
-    print(f"  Rows:    {len(rows)}")
-    print()
-    print("Iteration | IDF Version | CV(RMSE)% | NMBE% | Delta CV | Delta NMBE | PASS")
-    print("-" * 78)
+    nan = float("nan")
+    inf = float("inf")
+    lines = [
+        "=== Calibration Run Summary ===",
+        f"  Run dir: {run_dir}",
+        f"  Rows:    {len(rows)}",
+        "",
+        "Iteration | IDF Version | CV(RMSE)% | NMBE% | Delta CV | Delta NMBE | PASS",
+        "-" * 78,
+    ]
+    # Each metric is parsed once and reused for the table and the
+    # best-iteration score; the whole table goes out in one write.
+    scores = []
     for row in rows:
-        print(
-            f"{int(row['iteration']):>9} | "
-            f"{row['idf_version'][:20]:<20} | "
-            f"{_safe_float(row['cv_rmse']) if row['cv_rmse'] else float('nan'):>9.4f} | "
-            f"{_safe_float(row['nmbe']) if row['nmbe'] else float('nan'):>6.4f} | "
-            f"{(_safe_float(row['delta_cv_rmse_vs_prev']) if row['delta_cv_rmse_vs_prev'] else 0.0):>8.4f} | "
-            f"{(_safe_float(row['delta_nmbe_vs_prev']) if row['delta_nmbe_vs_prev'] else 0.0):>10.4f} | "
-            f"{row['pass_ashrae14']}"
+        cv_text = row[_COL_CV_RMSE]
+        nmbe_text = row[_COL_NMBE]
+        d_cv = row[_COL_DELTA_CV]
+        d_nmbe = row[_COL_DELTA_NMBE]
+        cv = _safe_float(cv_text)
+        nmbe = _safe_float(nmbe_text)
+        lines.append(
+            f"{int(row[_COL_ITERATION]):>9} | "
+            f"{row[_COL_IDF_VERSION]:<20.20} | "
+            f"{cv if cv_text else nan:>9.4f} | "
+            f"{nmbe if nmbe_text else nan:>6.4f} | "
+            f"{(_safe_float(d_cv) if d_cv else 0.0):>8.4f} | "
+            f"{(_safe_float(d_nmbe) if d_nmbe else 0.0):>10.4f} | "
+            f"{row[_COL_PASS]}"
         )
+        scores.append(abs(cv or inf) + abs(nmbe or inf))
 
-    best = min(
-        rows,
-        key=lambda r: abs(_safe_float(r.get("cv_rmse")) or float("inf"))
-        + abs(_safe_float(r.get("nmbe")) or float("inf")),
-    )
-    print()
-    print("Best iteration (min |CV| + |NMBE|):")
-    print(f"  iteration={best['iteration']}, idf_version={best['idf_version']}")
+    best = rows[scores.index(min(scores))]
+    lines.append("")
+    lines.append("Best iteration (min |CV| + |NMBE|):")
+    lines.append(f"  iteration={best[_COL_ITERATION]}, idf_version={best[_COL_IDF_VERSION]}")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
-def main():
+def main(argv=None):
     parser = argparse.ArgumentParser(
         description="Calibration iteration tracker",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -459,7 +650,7 @@ def main():
     p_sum = subparsers.add_parser("summary", help="Show concise run summary")
     p_sum.add_argument("--run-dir", required=True, help="Run directory")
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     if args.command is None:
         parser.print_help()
         sys.exit(1)
@@ -18,9 +18,10 @@ Field reference: EnergyPlus AuxiliaryPrograms.pdf, Section 2.9
 
 import argparse
 import csv
+import math
+from operator import itemgetter
 import os
 import sys
-from statistics import mean, stdev
 
 # ---------------------------------------------------------------------------
 # EPW field definitions — Source: AuxiliaryPrograms.pdf Section 2.9, p.62-63
@@ -68,18 +69,46 @@ EPW_FIELDS = [
 # Indices of key numeric fields for statistics (skip time, flags, weather codes)
 KEY_STAT_FIELDS = [6, 7, 8, 9, 14, 15, 20, 21, 22]
 
+# (index, name, missing_value, min_val, max_val) checked by validate, in
+# index order: skips time and flags fields, the weather codes text field
+# and fields with nothing to check.
+_RANGE_CHECK_FIELDS = tuple(
+    (f[0], f[1], f[3], f[4], f[5]) for f in EPW_FIELDS[6:]
+    if f[0] != 27 and (f[3], f[4], f[5]) != (None, None, None)
+)
+
 HEADER_LINE_COUNT = 8
+
+# Output buffer for commands that rewrite a whole EPW file row by row; a
+# full year fits in one or two flushes.
+_WRITE_BUFFER_SIZE = 1 << 20
 DEFAULT_DATA_SOURCE_FLAGS = "?9?9?9?9?9?9?9?9?9?9?9?9?9?9?9?9?9?9?9?9?9?9?9?9"
 
 
+class _AlnumTable(dict):
+    """str.translate table keeping letters and digits (any script) only.
+
+    Filled in per code point on demand.
+    """
+
+    def __missing__(self, codepoint):
+        out = codepoint if chr(codepoint).isalnum() else None
+        self[codepoint] = out
+        return out
+
+
+_ALNUM_TABLE = _AlnumTable()
+
+
 def _normalize_name(value):
     """Normalize names for robust fuzzy matching."""
     if value is None:
         return ""
-    return "".join(ch for ch in str(value).lower() if ch.isalnum())
+    return str(value).lower().translate(_ALNUM_TABLE)
 
 
 FIELD_NAME_MAP = {_normalize_name(f[1]): f[0] for f in EPW_FIELDS}
+_LOWER_FIELD_NAMES = [f[1].lower() for f in EPW_FIELDS]
 FIELD_ALIAS_MAP = {
     "temp": 6,
     "temperature": 6,
@@ -140,27 +169,29 @@ def _parse_location(location_str):
     return parts
 
 
-def _build_default_row(year, month, day, hour, minute=60):
-    """Build a default EPW data row with required time fields and missing markers."""
-    row = []
-    for idx, _, _, missing_val, _, _, _ in EPW_FIELDS:
-        if idx == 0:
-            row.append(str(year))
-        elif idx == 1:
-            row.append(str(month))
-        elif idx == 2:
-            row.append(str(day))
-        elif idx == 3:
-            row.append(str(hour))
-        elif idx == 4:
-            row.append(str(minute))
-        elif idx == 5:
-            row.append(DEFAULT_DATA_SOURCE_FLAGS)
-        elif missing_val is None:
-            row.append("")
-        else:
-            row.append(_format_missing(missing_val))
-    return row
+# Data row with every field at its missing marker; the time fields (0-4)
+# are filled in per row by the format built in _row_format.
+_DEFAULT_ROW_TEMPLATE = tuple(
+    DEFAULT_DATA_SOURCE_FLAGS if idx == 5
+    else "" if missing_val is None
+    else _format_missing(missing_val)
+    for idx, _, _, missing_val, _, _, _ in EPW_FIELDS
+)
+
+
+def _row_format(data_indices):
+    """Build a str.format template for one default EPW data row.
+
+    The template takes year, month, day, hour and minute, then one value per
+    entry of data_indices (in ascending order); every other field is already
+    folded in as its missing marker from _DEFAULT_ROW_TEMPLATE.
+    """
+    fields = [
+        "{}" if idx < 5 or idx in data_indices
+        else value.replace("{", "{{").replace("}", "}}")
+        for idx, value in enumerate(_DEFAULT_ROW_TEMPLATE)
+    ]
+    return ",".join(fields)
 
 
 def resolve_field(field_arg):
@@ -168,6 +199,7 @@ def resolve_field(field_arg):
 
     Supports:
       - Integer (1-based position as shown in docs, e.g. 7 = Dry Bulb Temperature)
+      - Full field name (case-insensitive, e.g. "Direct Normal Radiation")
       - Name substring match (case-insensitive, e.g. "dry bulb")
     """
     # Try integer index first (1-based as in documentation)
@@ -180,9 +212,15 @@ def resolve_field(field_arg):
     except ValueError:
         pass
 
+    # Exact field name (ignoring case, spaces and punctuation)
+    idx = FIELD_NAME_MAP.get(_normalize_name(field_arg))
+    if idx is not None:
+        return idx, EPW_FIELDS[idx]
+
     # Name substring match (case-insensitive)
     query = field_arg.lower()
-    matches = [(i, f) for i, f in enumerate(EPW_FIELDS) if query in f[1].lower()]
+    matches = [(i, EPW_FIELDS[i]) for i, name in enumerate(_LOWER_FIELD_NAMES)
+               if query in name]
     if len(matches) == 1:
         return matches[0]
     elif len(matches) > 1:
@@ -203,11 +241,17 @@ def parse_header(filepath):
     Returns dict with keys: location, design_conditions, typical_extreme,
     ground_temps, holidays, comments1, comments2, data_periods, raw_headers.
     """
-    info = {"raw_headers": []}
+    raw_headers = []
     with open(filepath, "r", encoding="utf-8", errors="replace") as f:
         for i in range(HEADER_LINE_COUNT):
             line = f.readline().rstrip("\n\r")
-            info["raw_headers"].append(line)
+            raw_headers.append(line)
+    return _parse_header_lines(raw_headers)
+
+
+def _parse_header_lines(raw_headers):
+    """Build the parse_header dict from the 8 header lines (newlines removed)."""
+    info = {"raw_headers": raw_headers}
 
     # Line 1: LOCATION
     parts = info["raw_headers"][0].split(",")
@@ -246,11 +290,15 @@ def parse_header(filepath):
     return info
 
 
-def iter_data_rows(filepath):
+def iter_data_rows(filepath, max_idx=None):
     """Yield (line_number, fields_list) for each data row (after 8 header lines).
 
-    Uses generator to avoid loading entire file into memory.
+    Uses generator to avoid loading entire file into memory. With max_idx,
+    only fields up to that index are split off: the list then ends with
+    the unsplit rest of the line, and len(fields) <= max_idx still means
+    the row is too short for max_idx.
     """
+    maxsplit = -1 if max_idx is None else max_idx + 1
     with open(filepath, "r", encoding="utf-8", errors="replace") as f:
         for i in range(HEADER_LINE_COUNT):
             f.readline()  # skip header lines
@@ -260,10 +308,100 @@ def iter_data_rows(filepath):
             stripped = line.rstrip("\n\r")
             if not stripped:
                 continue
-            fields = stripped.split(",")
+            fields = stripped.split(",", maxsplit)
             yield line_num, fields
 
 
+def _read_epw_lines(filepath):
+    """Read the whole file once; return (header_lines, data_lines).
+
+    header_lines always has HEADER_LINE_COUNT entries (padded with "" for
+    short files); data_lines keeps blank lines so that the line number of
+    data_lines[i] is HEADER_LINE_COUNT + 1 + i.
+    """
+    with open(filepath, "r", encoding="utf-8", errors="replace") as f:
+        lines = f.read().split("\n")
+    header_lines = lines[:HEADER_LINE_COUNT]
+    header_lines += [""] * (HEADER_LINE_COUNT - len(header_lines))
+    return header_lines, lines[HEADER_LINE_COUNT:]
+
+
+def _read_epw_bytes(filepath):
+    """Read the whole file once; return (header_info, data_lines).
+
+    data_lines are the non-blank data lines as undecoded bytes; only the
+    header lines are decoded.
+    """
+    with open(filepath, "rb") as f:
+        # bytes.splitlines breaks on \n, \r\n and \r, as text mode does
+        lines = f.read().splitlines()
+    header_lines = [line.decode("utf-8", "replace")
+                    for line in lines[:HEADER_LINE_COUNT]]
+    header_lines += [""] * (HEADER_LINE_COUNT - len(header_lines))
+    data_lines = [line for line in lines[HEADER_LINE_COUNT:] if line]
+    return _parse_header_lines(header_lines), data_lines
+
+
+def parse_epw(filepath, max_idx=None):
+    """Parse header and data rows from a single read of the file.
+
+    Returns (header_info, rows): header_info as from parse_header, rows as
+    the fields lists iter_data_rows(filepath, max_idx) would yield, but
+    with undecoded bytes fields. For commands that only convert columns
+    with float()/int(), which accept ASCII bytes directly.
+    """
+    maxsplit = -1 if max_idx is None else max_idx + 1
+    info, data_lines = _read_epw_bytes(filepath)
+    return info, [line.split(b",", maxsplit) for line in data_lines]
+
+
+def parse_epw_columns(filepath, indices):
+    """Read the numeric fields indices in a single pass over the rows.
+
+    Returns (header_info, row_count, {idx: values}) with values as
+    _column_values collects them from parse_epw's rows. Each row keeps
+    only the requested cells instead of its whole field list; files with
+    rows too short for some index take the parse_epw route.
+    """
+    maxsplit = max(indices) + 1
+    pick = itemgetter(*indices)
+    info, data_lines = _read_epw_bytes(filepath)
+    try:
+        cells = [pick(line.split(b",", maxsplit)) for line in data_lines]
+    except IndexError:
+        rows = [line.split(b",", maxsplit) for line in data_lines]
+        return info, len(rows), {idx: _column_values(rows, idx, EPW_FIELDS[idx][3])
+                                 for idx in indices}
+    if len(indices) == 1:
+        columns = [cells]  # itemgetter with one index returns bare cells
+    else:
+        columns = list(zip(*cells)) or [()] * len(indices)
+    return info, len(cells), {idx: _numeric_values(column, EPW_FIELDS[idx][3])
+                              for idx, column in zip(indices, columns)}
+
+
+def _numeric_values(cells, missing_val=None):
+    """Convert cells to floats, skipping missing/invalid ones.
+
+    Equivalent to parse_numeric on every (decoded) cell, but cells that
+    parse cleanly are converted with a single map(float).
+    """
+    try:
+        if missing_val is None:
+            return list(map(float, cells))
+        return [v for v in map(float, cells) if not v >= missing_val]
+    except ValueError:
+        values = (parse_numeric(cell.decode("utf-8", "replace"), missing_val)
+                  for cell in cells)
+        return [v for v in values if v is not None]
+
+
+def _column_values(rows, idx, missing_val=None):
+    """Collect the numeric values of field idx, skipping missing/invalid cells."""
+    return _numeric_values([fields[idx] for fields in rows if idx < len(fields)],
+                           missing_val)
+
+
 def parse_numeric(value_str, missing_val=None):
     """Parse a string to float, returning None if it's a missing value."""
     try:
@@ -275,31 +413,76 @@ def parse_numeric(value_str, missing_val=None):
         return None
 
 
+def build_time_matcher(month=None, day=None, hour=None,
+                       start_md=None, end_md=None):
+    """Build a fields -> bool predicate for the given time filters.
+
+    The filters are fixed for a whole command, so they are resolved once:
+    the predicate only tests the filters that are set, and without a date
+    range it rejects a row as soon as one of them fails.
+    """
+    exact = tuple((pos, value) for pos, value in ((1, month), (2, day), (3, hour))
+                  if value is not None)
+
+    if start_md is None and end_md is None:
+        def match(fields):
+            try:
+                for pos, value in exact:
+                    if int(fields[pos]) != value:
+                        return False
+                int(fields[1])
+                int(fields[2])
+                int(fields[3])
+            except (ValueError, IndexError):
+                return False
+            return True
+        return match
+
+    def match(fields):
+        try:
+            time = (int(fields[1]), int(fields[2]), int(fields[3]))
+        except (ValueError, IndexError):
+            return False
+        for pos, value in exact:
+            if time[pos - 1] != value:
+                return False
+        if start_md is not None and time[:2] < start_md:
+            return False
+        if end_md is not None and time[:2] > end_md:
+            return False
+        return True
+    return match
+
+
 def time_matches(fields, month=None, day=None, hour=None,
                  start_md=None, end_md=None):
-    """Check if a data row's time matches the given filters."""
+    """Check if a data row's time matches the given filters.
+
+    One-off form of build_time_matcher(); loops should build the
+    predicate once instead.
+    """
+    return build_time_matcher(month, day, hour, start_md, end_md)(fields)
+
+
+def _check_io_paths(filepath, outpath):
+    """Exit unless filepath exists and outpath is a different file.
+
+    Both paths are stat'ed once; comparing the stat results also catches
+    an output that reaches the input through a symlink or hard link, which
+    would otherwise be truncated before it is read.
+    """
     try:
-        m = int(fields[1])
-        d = int(fields[2])
-        h = int(fields[3])
-    except (ValueError, IndexError):
-        return False
-
-    if month is not None and m != month:
-        return False
-    if day is not None and d != day:
-        return False
-    if hour is not None and h != hour:
-        return False
-    if start_md is not None:
-        sm, sd = start_md
-        if (m, d) < (sm, sd):
-            return False
-    if end_md is not None:
-        em, ed = end_md
-        if (m, d) > (em, ed):
-            return False
-    return True
+        in_stat = os.stat(filepath)
+    except OSError:
+        print(f"Error: File not found: {filepath}")
+        sys.exit(1)
+    try:
+        same = os.path.samestat(in_stat, os.stat(outpath))
+    except OSError:
+        same = False
+    if same or filepath == outpath:
+        print("Error: Output path must be different from input path")
+        sys.exit(1)
 
 
 def parse_md(md_str):
@@ -315,6 +498,21 @@ def parse_md(md_str):
         sys.exit(1)
 
 
+def _mean(values):
+    """Arithmetic mean of a non-empty list of floats."""
+    return sum(values) / len(values)
+
+
+def _stdev(values, avg=None):
+    """Sample standard deviation (two passes: mean, then squared deviations).
+
+    Pass avg when the mean is already known to skip the first pass.
+    """
+    if avg is None:
+        avg = sum(values) / len(values)
+    return math.sqrt(sum([(v - avg) * (v - avg) for v in values]) / (len(values) - 1))
+
+
 # ---------------------------------------------------------------------------
 # Commands
 # ---------------------------------------------------------------------------
@@ -326,34 +524,16 @@ def cmd_summary(args):
         print(f"Error: File not found: {filepath}")
         sys.exit(1)
 
-    info = parse_header(filepath)
+    info, row_count, stats = parse_epw_columns(filepath, KEY_STAT_FIELDS)
     loc = info["location"]
     dp = info["data_periods"]
 
-    # Collect statistics from data rows
-    row_count = 0
-    stats = {}
-    for idx in KEY_STAT_FIELDS:
-        stats[idx] = []
-    temp_for_dd = []  # for degree days
+    temp_for_dd = stats[6]  # dry bulb (missing >= 99.9 already dropped)
 
-    for _, fields in iter_data_rows(filepath):
-        row_count += 1
-        for idx in KEY_STAT_FIELDS:
-            if idx < len(fields):
-                finfo = EPW_FIELDS[idx]
-                val = parse_numeric(fields[idx], finfo[3])
-                if val is not None:
-                    stats[idx].append(val)
-        # Dry bulb for degree days
-        if len(fields) > 6:
-            db = parse_numeric(fields[6], 99.9)
-            if db is not None:
-                temp_for_dd.append(db)
-
-    # Calculate HDD and CDD (base 18C)
-    hdd18 = sum(max(0, 18.0 - t) / 24.0 for t in temp_for_dd)
-    cdd18 = sum(max(0, t - 18.0) / 24.0 for t in temp_for_dd)
+    # Calculate HDD and CDD (base 18C); hours on the other side of the
+    # base contribute nothing, so they are skipped rather than summed as 0.
+    hdd18 = sum((18.0 - t) / 24.0 for t in temp_for_dd if t < 18.0)
+    cdd18 = sum((t - 18.0) / 24.0 for t in temp_for_dd if t > 18.0)
 
     # Radiation totals (Wh/m2 -> kWh/m2/year)
     rad_14 = sum(v for v in stats.get(14, []))  # Direct Normal
@@ -391,7 +571,7 @@ def cmd_summary(args):
         else:
             mn = min(vals)
             mx = max(vals)
-            avg = mean(vals)
+            avg = _mean(vals)
             print(f"  {name + ':':<42s} min={mn:>8.1f}  max={mx:>8.1f}"
                   f"  mean={avg:>8.1f}  {units}")
 
@@ -421,15 +601,38 @@ def cmd_read(args):
     rows_shown = 0
     max_show = 50
 
-    for _, fields in iter_data_rows(filepath):
-        if not time_matches(fields, args.month, args.day, args.hour,
-                            start_md, end_md):
+    # A single data period starting on 1/1 runs in calendar order, so once
+    # a row is past --end no later row can match.
+    stop_after_end = False
+    if end_md is not None:
+        dp = parse_header(filepath)["data_periods"]
+        stop_after_end = (dp["count"] == 1
+                          and dp["start_date"].replace(" ", "") == "1/1")
+
+    matches = build_time_matcher(args.month, args.day, args.hour,
+                                 start_md, end_md)
+    missing_val = finfo[3]
+    for _, fields in iter_data_rows(filepath, max(field_idx, 3)):
+        if not matches(fields):
+            if stop_after_end:
+                try:
+                    if (int(fields[1]), int(fields[2])) > end_md:
+                        break
+                except (ValueError, IndexError):
+                    pass
             continue
         if field_idx >= len(fields):
             continue
 
         raw_val = fields[field_idx]
-        val = parse_numeric(raw_val, finfo[3])
+        # parse_numeric, inlined for the per-row loop
+        try:
+            val = float(raw_val)
+        except ValueError:
+            val = None
+        else:
+            if missing_val is not None and val >= missing_val:
+                val = None
 
         if rows_shown < max_show:
             try:
@@ -456,9 +659,10 @@ def cmd_read(args):
         print(f"  Count:   {len(values)}")
         print(f"  Min:     {min(values):.4f}")
         print(f"  Max:     {max(values):.4f}")
-        print(f"  Mean:    {mean(values):.4f}")
+        avg = _mean(values)
+        print(f"  Mean:    {avg:.4f}")
         if len(values) > 1:
-            print(f"  StdDev:  {stdev(values):.4f}")
+            print(f"  StdDev:  {_stdev(values, avg):.4f}")
     else:
         print("  No valid data points found.")
 
@@ -467,12 +671,7 @@ def cmd_write(args):
     """Write (modify) a specific field in EPW data rows."""
     filepath = os.path.abspath(args.epw_path)
     outpath = os.path.abspath(args.output)
-    if not os.path.exists(filepath):
-        print(f"Error: File not found: {filepath}")
-        sys.exit(1)
-    if os.path.abspath(filepath) == os.path.abspath(outpath):
-        print("Error: Output path must be different from input path")
-        sys.exit(1)
+    _check_io_paths(filepath, outpath)
 
     field_idx, finfo = resolve_field(args.field)
     start_md = parse_md(args.start) if args.start else None
@@ -488,11 +687,14 @@ def cmd_write(args):
         print(f"Error: Invalid value '{args.value}' for field {finfo[1]}")
         sys.exit(1)
 
+    matches = build_time_matcher(args.month, args.day, args.hour,
+                                 start_md, end_md)
     modified_count = 0
     total_data_rows = 0
 
     with open(filepath, "r", encoding="utf-8", errors="replace") as fin, \
-         open(outpath, "w", encoding="utf-8", newline="") as fout:
+         open(outpath, "w", encoding="utf-8", newline="",
+              buffering=_WRITE_BUFFER_SIZE) as fout:
 
         # Copy header lines
         for i in range(HEADER_LINE_COUNT):
@@ -506,10 +708,14 @@ def cmd_write(args):
                 continue
 
             total_data_rows += 1
-            fields = stripped.split(",")
+            # Only the time fields are needed to reject a row; rows that
+            # are not modified are written back as they are.
+            if not matches(stripped.split(",", 4)):
+                fout.write(stripped + "\n")
+                continue
 
-            if (time_matches(fields, args.month, args.day, args.hour,
-                             start_md, end_md) and field_idx < len(fields)):
+            fields = stripped.split(",")
+            if field_idx < len(fields):
                 fields[field_idx] = new_value
                 modified_count += 1
 
@@ -528,15 +734,10 @@ def cmd_inject(args):
     csv_path = os.path.abspath(args.csv)
     outpath = os.path.abspath(args.output)
 
-    if not os.path.exists(filepath):
-        print(f"Error: File not found: {filepath}")
-        sys.exit(1)
+    _check_io_paths(filepath, outpath)
     if not os.path.exists(csv_path):
         print(f"Error: CSV file not found: {csv_path}")
         sys.exit(1)
-    if os.path.abspath(filepath) == os.path.abspath(outpath):
-        print("Error: Output path must be different from input path")
-        sys.exit(1)
 
     # Parse mapping: "csv_col:epw_field,csv_col:epw_field"
     mappings = []
@@ -549,12 +750,21 @@ def cmd_inject(args):
         epw_idx, epw_finfo = resolve_field(parts[1].strip())
         mappings.append((csv_col, epw_idx, epw_finfo))
 
-    # Read CSV data into a lookup dict keyed by (month, day, hour)
+    # Read the mapped CSV values column-wise (one stripped list per mapping)
+    # and index them by (month, day, hour)
     csv_data = {}
+    columns = [[] for _ in mappings]
     time_cols = None
     with open(csv_path, "r", encoding="utf-8", errors="replace") as cf:
-        reader = csv.DictReader(cf)
-        headers_lower = {h.lower().strip(): h for h in reader.fieldnames}
+        reader = csv.reader(cf)
+        fieldnames = next(reader, None)
+        if not fieldnames:
+            print("Error: CSV has no header row")
+            sys.exit(1)
+        # Columns are read by position; a repeated header name refers to
+        # its last column.
+        positions = {h: i for i, h in enumerate(fieldnames)}
+        headers_lower = {h.lower().strip(): h for h in fieldnames}
 
         # Detect time columns
         for month_key in ["month", "mon", "m"]:
@@ -587,19 +797,28 @@ def cmd_inject(args):
 
         # Verify mapping columns exist in CSV
         for csv_col, _, _ in mappings:
-            if csv_col not in reader.fieldnames:
+            if csv_col not in positions:
                 print(f"Error: CSV column '{csv_col}' not found. "
-                      f"Available: {', '.join(reader.fieldnames)}")
+                      f"Available: {', '.join(fieldnames)}")
                 sys.exit(1)
 
+        month_pos = positions[month_col]
+        day_pos = positions[day_col]
+        hour_pos = positions[hour_col]
+        value_positions = [positions[csv_col] for csv_col, _, _ in mappings]
+
         for row in reader:
+            if not row:
+                continue
             try:
-                m = int(row[month_col])
-                d = int(row[day_col])
-                h = int(row[hour_col])
-            except (ValueError, KeyError):
+                m = int(row[month_pos])
+                d = int(row[day_pos])
+                h = int(row[hour_pos])
+            except (ValueError, IndexError):
                 continue
-            csv_data[(m, d, h)] = row
+            csv_data[(m, d, h)] = len(columns[0])
+            for column, pos in zip(columns, value_positions):
+                column.append(row[pos].strip() if pos < len(row) else "")
 
     print(f"  CSV data loaded: {len(csv_data)} rows")
 
@@ -608,7 +827,8 @@ def cmd_inject(args):
     total_data_rows = 0
 
     with open(filepath, "r", encoding="utf-8", errors="replace") as fin, \
-         open(outpath, "w", encoding="utf-8", newline="") as fout:
+         open(outpath, "w", encoding="utf-8", newline="",
+              buffering=_WRITE_BUFFER_SIZE) as fout:
 
         # Copy header lines
         for i in range(HEADER_LINE_COUNT):
@@ -622,23 +842,29 @@ def cmd_inject(args):
                 continue
 
             total_data_rows += 1
-            fields = stripped.split(",")
+            # Split off the time fields first; rows without CSV data are
+            # written back as they are.
+            head = stripped.split(",", 4)
 
             try:
-                m = int(fields[1])
-                d = int(fields[2])
-                h = int(fields[3])
+                m = int(head[1])
+                d = int(head[2])
+                h = int(head[3])
             except (ValueError, IndexError):
-                fout.write(",".join(fields) + "\n")
+                fout.write(stripped + "\n")
+                continue
+
+            pos = csv_data.get((m, d, h))
+            if pos is None:
+                fout.write(stripped + "\n")
                 continue
 
-            key = (m, d, h)
-            if key in csv_data:
-                row = csv_data[key]
-                for csv_col, epw_idx, _ in mappings:
-                    if csv_col in row and row[csv_col].strip():
-                        fields[epw_idx] = row[csv_col].strip()
-                injected_count += 1
+            fields = stripped.split(",")
+            for (_, epw_idx, _), column in zip(mappings, columns):
+                value = column[pos]
+                if value:
+                    fields[epw_idx] = value
+            injected_count += 1
 
             fout.write(",".join(fields) + "\n")
 
@@ -662,7 +888,8 @@ def cmd_validate(args):
     warnings = []
 
     # Check header
-    info = parse_header(filepath)
+    header_lines, data_lines = _read_epw_lines(filepath)
+    info = _parse_header_lines(header_lines)
     loc = info["location"]
     if not loc["city"] or loc["city"] == "Unknown":
         errors.append("Line 1: LOCATION header missing or malformed")
@@ -680,7 +907,10 @@ def cmd_validate(args):
     field_count_errors = []
     prev_time = None
 
-    for line_num, fields in iter_data_rows(filepath):
+    for line_num, line in enumerate(data_lines, HEADER_LINE_COUNT + 1):
+        if not line:
+            continue
+        fields = line.split(",")
         row_count += 1
 
         # Field count check
@@ -710,27 +940,23 @@ def cmd_validate(args):
             continue
 
         # Numeric range checks
-        for fdef in EPW_FIELDS[6:]:  # skip time and flags fields
-            idx = fdef[0]
-            if idx >= len(fields):
-                continue
-            if idx in (27,):  # text field (weather codes)
-                continue
-            val = parse_numeric(fields[idx], None)
-            if val is None:
+        field_count = len(fields)
+        for idx, name, missing_val, min_val, max_val in _RANGE_CHECK_FIELDS:
+            if idx >= field_count:
+                break
+            try:
+                val = float(fields[idx])
+            except ValueError:
                 continue
-            missing_val = fdef[3]
             if missing_val is not None and val >= missing_val:
                 missing_counts[idx] = missing_counts.get(idx, 0) + 1
                 continue
-            min_val = fdef[4]
-            max_val = fdef[5]
             if min_val is not None and val < min_val:
                 range_violations.append(
-                    f"Line {line_num}: {fdef[1]} = {val} < min {min_val}")
+                    f"Line {line_num}: {name} = {val} < min {min_val}")
             if max_val is not None and val > max_val:
                 range_violations.append(
-                    f"Line {line_num}: {fdef[1]} = {val} > max {max_val}")
+                    f"Line {line_num}: {name} = {val} > max {max_val}")
 
     # Expected row count
     expected = 8760
@@ -805,9 +1031,6 @@ def cmd_stats(args):
         print(f"Error: File not found: {filepath}")
         sys.exit(1)
 
-    info = parse_header(filepath)
-    loc = info["location"]
-
     # Determine which fields to analyze
     if args.field:
         field_idx, finfo = resolve_field(args.field)
@@ -817,21 +1040,23 @@ def cmd_stats(args):
 
     if args.monthly:
         # Monthly statistics
-        monthly_data = {m: {idx: [] for idx in target_fields} for m in range(1, 13)}
-
-        for _, fields in iter_data_rows(filepath):
+        info, rows = parse_epw(filepath, max(max(target_fields), 1))
+        loc = info["location"]
+        rows_by_month = {m: [] for m in range(1, 13)}
+        for fields in rows:
             try:
                 m = int(fields[1])
             except (ValueError, IndexError):
                 continue
             if m < 1 or m > 12:
                 continue
-            for idx in target_fields:
-                if idx < len(fields):
-                    fdef = EPW_FIELDS[idx]
-                    val = parse_numeric(fields[idx], fdef[3])
-                    if val is not None:
-                        monthly_data[m][idx].append(val)
+            rows_by_month[m].append(fields)
+
+        monthly_data = {
+            m: {idx: _column_values(month_rows, idx, EPW_FIELDS[idx][3])
+                for idx in target_fields}
+            for m, month_rows in rows_by_month.items()
+        }
 
         month_names = ["Jan", "Feb", "Mar", "Apr", "May", "Jun",
                        "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
@@ -852,23 +1077,16 @@ def cmd_stats(args):
                     continue
                 mn = min(vals)
                 mx = max(vals)
-                avg = mean(vals)
-                sd = stdev(vals) if len(vals) > 1 else 0.0
+                avg = _mean(vals)
+                sd = _stdev(vals, avg) if len(vals) > 1 else 0.0
                 print(f"  {month_names[m-1]:<6s} {len(vals):>6d} {mn:>8.1f} "
                       f"{mx:>8.1f} {avg:>8.1f} {sd:>8.1f}")
             print()
 
     else:
         # Annual statistics
-        annual_data = {idx: [] for idx in target_fields}
-
-        for _, fields in iter_data_rows(filepath):
-            for idx in target_fields:
-                if idx < len(fields):
-                    fdef = EPW_FIELDS[idx]
-                    val = parse_numeric(fields[idx], fdef[3])
-                    if val is not None:
-                        annual_data[idx].append(val)
+        info, _, annual_data = parse_epw_columns(filepath, target_fields)
+        loc = info["location"]
 
         print(f"=== EPW Annual Statistics: {loc['city']} ===")
         print()
@@ -884,8 +1102,8 @@ def cmd_stats(args):
                 continue
             mn = min(vals)
             mx = max(vals)
-            avg = mean(vals)
-            sd = stdev(vals) if len(vals) > 1 else 0.0
+            avg = _mean(vals)
+            sd = _stdev(vals, avg) if len(vals) > 1 else 0.0
             print(f"  {fdef[1]:<42s} {len(vals):>6d} {mn:>8.1f} {mx:>8.1f} "
                   f"{avg:>8.1f} {sd:>8.1f} {fdef[2]:<10s}")
 
@@ -903,12 +1121,13 @@ def cmd_create(args):
 
     data_rows = {}
     with open(csv_path, "r", encoding="utf-8-sig", errors="replace") as cf:
-        reader = csv.DictReader(cf)
-        if not reader.fieldnames:
+        reader = csv.reader(cf)
+        fieldnames = next(reader, None)
+        if not fieldnames:
             print("Error: CSV has no header row")
             sys.exit(1)
 
-        headers = [h.replace("\ufeff", "").strip() for h in reader.fieldnames]
+        headers = [h.replace("\ufeff", "").strip() for h in fieldnames]
         headers_norm = {_normalize_name(h): h for h in headers}
 
         month_col = headers_norm.get("month") or headers_norm.get("mon") or headers_norm.get("m")
@@ -922,41 +1141,59 @@ def cmd_create(args):
             print(f"  Found columns: {', '.join(headers)}")
             sys.exit(1)
 
-        resolved_headers = {}
-        for h in headers:
+        # Columns are read by position under their cleaned header name; a
+        # repeated name refers to its last column.
+        positions = {h: i for i, h in enumerate(headers)}
+        month_pos = positions[month_col]
+        day_pos = positions[day_col]
+        hour_pos = positions[hour_col]
+        year_pos = positions.get(year_col)
+        minute_pos = positions.get(minute_col)
+
+        # EPW field index -> CSV columns feeding it; later non-empty values win.
+        data_slots = {}
+        for h, pos in positions.items():
             idx = _resolve_header_to_field_index(h)
-            if idx is not None:
-                resolved_headers[h] = idx
+            if idx is not None and idx > 4:
+                data_slots.setdefault(idx, []).append(pos)
+        slot_indices = sorted(data_slots)
+        row_format = _row_format(slot_indices)
+        slots = [(data_slots[idx], _DEFAULT_ROW_TEMPLATE[idx]) for idx in slot_indices]
 
         for row in reader:
             try:
-                month = int(row.get(month_col, "").strip())
-                day = int(row.get(day_col, "").strip())
-                hour = int(row.get(hour_col, "").strip())
-            except ValueError:
+                month = int(row[month_pos])
+                day = int(row[day_pos])
+                hour = int(row[hour_pos])
+            except (ValueError, IndexError):
                 continue
 
-            try:
-                year = int(row.get(year_col, "").strip()) if year_col and row.get(year_col, "").strip() else 2002
-            except ValueError:
-                year = 2002
-            try:
-                minute = int(row.get(minute_col, "").strip()) if minute_col and row.get(minute_col, "").strip() else 60
-            except ValueError:
-                minute = 60
-
-            fields = _build_default_row(year, month, day, hour, minute)
-            for header, idx in resolved_headers.items():
-                if idx in (0, 1, 2, 3, 4):
-                    continue
-                value = row.get(header, "")
-                if value is None:
-                    continue
-                value = value.strip()
-                if value:
-                    fields[idx] = value
-
-            data_rows[(month, day, hour)] = fields
+            year = 2002
+            if year_pos is not None and year_pos < len(row):
+                try:
+                    year = int(row[year_pos])
+                except ValueError:
+                    pass
+            minute = 60
+            if minute_pos is not None and minute_pos < len(row):
+                try:
+                    minute = int(row[minute_pos])
+                except ValueError:
+                    pass
+
+            n_cells = len(row)
+            values = []
+            for slot_positions, default in slots:
+                field_value = default
+                for pos in slot_positions:
+                    if pos < n_cells:
+                        value = row[pos].strip()
+                        if value:
+                            field_value = value
+                values.append(field_value)
+
+            data_rows[(month, day, hour)] = row_format.format(
+                year, month, day, hour, minute, *values)
 
     if not data_rows:
         print("Error: No valid data rows found in CSV")
@@ -977,13 +1214,8 @@ def cmd_create(args):
         f.write(f"COMMENTS 2,Source CSV: {os.path.basename(csv_path)}\n")
         f.write("DATA PERIODS,1,1,Data,Sunday, 1/ 1,12/31\n")
 
-        for key in sorted_keys:
-            row = data_rows[key]
-            if len(row) < 35:
-                row = row + [""] * (35 - len(row))
-            elif len(row) > 35:
-                row = row[:35]
-            f.write(",".join(row) + "\n")
+        f.write("\n".join([data_rows[key] for key in sorted_keys]))
+        f.write("\n")
 
     count = len(sorted_keys)
     print("=== EPW Create Complete ===")
@@ -996,35 +1228,20 @@ def cmd_create(args):
 
 def _collect_compare_metrics(epw_path):
     """Collect compact EPW metrics for side-by-side compare."""
-    info = parse_header(epw_path)
-    stats = {idx: [] for idx in KEY_STAT_FIELDS}
-    dry_bulb = []
-    rows = 0
-
-    for _, fields in iter_data_rows(epw_path):
-        rows += 1
-        for idx in KEY_STAT_FIELDS:
-            if idx < len(fields):
-                fdef = EPW_FIELDS[idx]
-                value = parse_numeric(fields[idx], fdef[3])
-                if value is not None:
-                    stats[idx].append(value)
-        if len(fields) > 6:
-            value = parse_numeric(fields[6], 99.9)
-            if value is not None:
-                dry_bulb.append(value)
+    info, row_count, stats = parse_epw_columns(epw_path, KEY_STAT_FIELDS)
 
     means = {}
     for idx in KEY_STAT_FIELDS:
-        values = stats.get(idx, [])
-        means[idx] = mean(values) if values else None
+        values = stats[idx]
+        means[idx] = _mean(values) if values else None
 
-    hdd18 = sum(max(0, 18.0 - t) / 24.0 for t in dry_bulb)
-    cdd18 = sum(max(0, t - 18.0) / 24.0 for t in dry_bulb)
+    dry_bulb = stats[6]  # missing >= 99.9 already dropped
+    hdd18 = sum((18.0 - t) / 24.0 for t in dry_bulb if t < 18.0)
+    cdd18 = sum((t - 18.0) / 24.0 for t in dry_bulb if t > 18.0)
 
     return {
         "info": info,
-        "rows": rows,
+        "rows": row_count,
         "means": means,
         "hdd18": hdd18,
         "cdd18": cdd18,
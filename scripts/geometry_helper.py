@@ -30,12 +30,35 @@ def _load_idf_helper():
     return parse_idf
 
 
+def _parse_idf_with_lines(idf_path):
+    """Read an IDF once; return (objects, lines) for commands that rewrite it."""
+    sys.path.insert(0, SCRIPTS_DIR)
+    from idf_helper import parse_idf_lines
+    if not os.path.exists(idf_path):
+        print(f"Error: IDF file not found: {idf_path}")
+        sys.exit(1)
+    with open(idf_path, "r", encoding="utf-8", errors="replace") as f:
+        lines = f.readlines()
+    return parse_idf_lines(lines), lines
+
+
 def _get_objects_by_type(objects, type_name):
     """Filter objects by type (case-insensitive)."""
     t = type_name.lower()
     return [o for o in objects if o["type"].lower() == t]
 
 
+def _field_lower(obj, idx):
+    """Return field idx of an object stripped and lowercased ("" if absent).
+
+    Matches the name/zone/parent values of extract_surface_data and
+    extract_fenestration_data, so objects can be selected by name before
+    their geometry is computed.
+    """
+    f = obj["fields"]
+    return f[idx].strip().lower() if len(f) > idx else ""
+
+
 # ---------------------------------------------------------------------------
 # Vertex parsing
 # ---------------------------------------------------------------------------
@@ -49,16 +72,12 @@ def parse_vertices(fields, vertex_start=11):
     Returns list of (x, y, z) tuples.
     """
     coords = []
-    i = vertex_start
-    while i + 2 < len(fields):
-        try:
-            x = float(fields[i].strip())
-            y = float(fields[i + 1].strip())
-            z = float(fields[i + 2].strip())
-            coords.append((x, y, z))
-        except (ValueError, IndexError):
-            break
-        i += 3
+    try:
+        for i in range(vertex_start, len(fields) - 2, 3):
+            coords.append((float(fields[i]), float(fields[i + 1]),
+                           float(fields[i + 2])))
+    except ValueError:
+        pass
     return coords
 
 
@@ -87,15 +106,17 @@ def newell_normal(vertices):
     Returns (nx, ny, nz) — not normalized.
     Reference: Newell (1972), adapted for EnergyPlus coordinate system.
     """
-    n = len(vertices)
     nx = ny = nz = 0.0
-    for i in range(n):
-        j = (i + 1) % n
-        vi = vertices[i]
-        vj = vertices[j]
-        nx += (vi[1] - vj[1]) * (vi[2] + vj[2])
-        ny += (vi[2] - vj[2]) * (vi[0] + vj[0])
-        nz += (vi[0] - vj[0]) * (vi[1] + vj[1])
+    if not vertices:
+        return (nx, ny, nz)
+    # Walk the edges (v0,v1), (v1,v2), ..., (vn-1,v0) in order, carrying
+    # the previous vertex as unpacked locals instead of indexing twice.
+    x1, y1, z1 = vertices[0]
+    for x2, y2, z2 in vertices[1:] + vertices[:1]:
+        nx += (y1 - y2) * (z1 + z2)
+        ny += (z1 - z2) * (x1 + x2)
+        nz += (x1 - x2) * (y1 + y2)
+        x1, y1, z1 = x2, y2, z2
     return (nx, ny, nz)
 
 
@@ -123,18 +144,22 @@ def surface_azimuth_tilt(vertices):
     - tilt: 0=facing up (floor/ceiling), 90=vertical (wall), 180=facing down
     - azimuth: degrees from north, clockwise (0=N, 90=E, 180=S, 270=W)
     """
-    nx, ny, nz = vec_normalize(newell_normal(vertices))
+    return _azimuth_tilt_from_normal(newell_normal(vertices))
+
+
+def _azimuth_tilt_from_normal(normal):
+    """Azimuth and tilt from an (unnormalized) Newell normal."""
+    nx, ny, nz = vec_normalize(normal)
 
     # Tilt from Z-axis
     tilt = math.degrees(math.acos(max(-1, min(1, nz))))
 
-    # Azimuth from Y-axis (north), clockwise
+    # Azimuth from Y-axis (north), clockwise; % 360 folds atan2's
+    # (-180, 0) half (and -0.0) into [0, 360).
     if abs(nx) < 1e-10 and abs(ny) < 1e-10:
         azimuth = 0.0  # horizontal surface
     else:
-        azimuth = math.degrees(math.atan2(nx, ny))
-        if azimuth < 0:
-            azimuth += 360
+        azimuth = math.degrees(math.atan2(nx, ny)) % 360.0
 
     return azimuth, tilt
 
@@ -158,8 +183,14 @@ def extract_surface_data(obj, vertex_start=11):
     """Extract geometry data from a BuildingSurface:Detailed object."""
     f = obj["fields"]
     verts = parse_vertices(f, vertex_start)
-    area = polygon_area(verts) if verts else 0
-    az, tilt = surface_azimuth_tilt(verts) if verts else (0, 0)
+    if verts:
+        # One Newell pass feeds both the area and the orientation.
+        normal = newell_normal(verts)
+        area = vec_length(normal) / 2.0
+        az, tilt = _azimuth_tilt_from_normal(normal)
+    else:
+        area = 0
+        az, tilt = (0, 0)
 
     return {
         "name": f[0].strip() if len(f) > 0 else "",
@@ -196,6 +227,22 @@ def extract_fenestration_data(obj):
     }
 
 
+def _surface_name_vertices(obj, vertex_start):
+    """Return (name, vertices) of a surface object without area/orientation math."""
+    f = obj["fields"]
+    return (f[0].strip() if len(f) > 0 else ""), parse_vertices(f, vertex_start)
+
+
+def _scale_vertices(vertices, axis_idx, ref, factor):
+    """Scale coordinate axis_idx of each vertex by factor about the value ref."""
+    new_verts = []
+    for v in vertices:
+        nv = list(v)
+        nv[axis_idx] = ref + (v[axis_idx] - ref) * factor
+        new_verts.append(tuple(nv))
+    return new_verts
+
+
 # ---------------------------------------------------------------------------
 # IDF modification helpers
 # ---------------------------------------------------------------------------
@@ -225,22 +272,21 @@ def _rebuild_surface_text(obj_type, fields, vertices, vertex_start):
     return "\n".join(lines) + "\n"
 
 
-def modify_idf_surfaces(src_path, dst_path, surface_mods):
+def modify_idf_surfaces(src_path, dst_path, surface_mods, objects=None, lines=None):
     """Modify surface vertices in an IDF file.
 
     surface_mods: dict mapping surface_name -> new_vertices list
+    objects, lines: _parse_idf_with_lines(src_path) result, if the caller
+    already has it
     """
-    parse_idf = _load_idf_helper()
-    objects = parse_idf(src_path)
-
-    with open(src_path, "r", encoding="utf-8", errors="replace") as f:
-        lines = f.readlines()
+    if objects is None or lines is None:
+        objects, lines = _parse_idf_with_lines(src_path)
 
     # Build modification map
     mod_map = {name.lower(): verts for name, verts in surface_mods.items()}
     modified_count = 0
 
-    # Process objects in reverse order (to not invalidate line numbers)
+    # Targets in file order, so the output can be written front to back
     targets = []
     for obj in objects:
         if obj["type"].lower() in ("buildingsurface:detailed",
@@ -249,59 +295,41 @@ def modify_idf_surfaces(src_path, dst_path, surface_mods):
             if name in mod_map:
                 targets.append(obj)
 
-    targets.sort(key=lambda o: o["line_start"], reverse=True)
-
-    for obj in targets:
-        name = obj["fields"][0].strip().lower()
-        new_verts = mod_map[name]
-        vstart = 11 if obj["type"].lower() == "buildingsurface:detailed" else 9
-
-        # Build new fields: header + new vertex coords
-        header = obj["fields"][:vstart]
-        new_vert_fields = vertices_to_fields(new_verts)
-        all_fields = header + new_vert_fields
-
-        # Rebuild the object text preserving comments from original
-        new_text = _rebuild_object_from_raw(obj, all_fields, vstart)
-
-        # Replace lines (line_start/line_end are 1-based from parse_idf)
-        start = obj["line_start"] - 1  # convert to 0-based
-        end = obj["line_end"]          # 1-based end = 0-based exclusive end
-        lines[start:end] = [new_text]
-        modified_count += 1
+    targets.sort(key=lambda o: o["line_start"])
 
     with open(dst_path, "w", encoding="utf-8", newline="") as f:
-        f.writelines(lines)
+        cursor = 0  # 0-based index of the first source line not yet written
+        for obj in targets:
+            name = obj["fields"][0].strip().lower()
+            new_verts = mod_map[name]
+            vstart = 11 if obj["type"].lower() == "buildingsurface:detailed" else 9
+
+            # Build new fields: header + new vertex coords
+            header = obj["fields"][:vstart]
+            new_vert_fields = vertices_to_fields(new_verts)
+            all_fields = header + new_vert_fields
+
+            # Rebuild the object text preserving comments from original
+            new_text = _rebuild_object_from_raw(obj, all_fields, vstart)
+
+            # Copy the untouched lines before the object, then the new text
+            # (line_start/line_end are 1-based from parse_idf)
+            start = obj["line_start"] - 1  # convert to 0-based
+            f.writelines(lines[cursor:start])
+            f.write(new_text)
+            cursor = obj["line_end"]       # 1-based end = 0-based exclusive end
+            modified_count += 1
+        f.writelines(lines[cursor:])
 
     return modified_count
 
 
 def _rebuild_object_from_raw(obj, new_fields, vertex_start):
-    """Rebuild object text preserving formatting where possible.
+    """Rebuild object text with one field per line.
 
-    Uses original raw text for header fields, regenerates vertex section.
+    Header fields (indices 0 to vertex_start-1) are written from new_fields
+    as given, followed by the regenerated vertex section.
     """
-    raw_lines = obj["raw"].split("\n")
-
-    # Strategy: keep raw lines up through header, replace vertex lines
-    # Count fields in raw lines to find where vertices start
-    field_count = 0
-    header_end_line = 0
-
-    for i, line in enumerate(raw_lines):
-        code = line.split("!")[0]
-        if "," in code or ";" in code:
-            # Count fields (separated by commas or terminated by semicolon)
-            parts = code.replace(";", ",").split(",")
-            for p in parts:
-                if p.strip():
-                    field_count += 1
-            if field_count > vertex_start:
-                header_end_line = i
-                break
-            header_end_line = i + 1
-
-    # Keep header lines (type line + header fields)
     result_lines = []
 
     # Type line
@@ -325,6 +353,11 @@ def _rebuild_object_from_raw(obj, new_fields, vertex_start):
 # Commands
 # ---------------------------------------------------------------------------
 
+# One list-surfaces row; text columns are truncated to their width.
+_SURFACE_ROW_FMT = ("  {:<25.25s} {:<10.10s} {:<30.30s} "
+                    "{:>9.2f} {:>8.0f} {:>6.0f} {:>5d}")
+
+
 def cmd_list_surfaces(args):
     """List all building surfaces with geometry info."""
     parse_idf = _load_idf_helper()
@@ -358,15 +391,9 @@ def cmd_list_surfaces(args):
     print(f"  {'-'*93}")
 
     for d in data:
-        name = d["name"][:25]
-        stype = d["surface_type"][:10]
-        zone = d["zone"][:30]
-        area = f"{d['area']:.2f}"
-        az = f"{d['azimuth']:.0f}"
-        tilt = f"{d['tilt']:.0f}"
-        nv = str(d["n_vertices"])
-        print(f"  {name:<25s} {stype:<10s} {zone:<30s} "
-              f"{area:>9s} {az:>8s} {tilt:>6s} {nv:>5s}")
+        print(_SURFACE_ROW_FMT.format(
+            d["name"], d["surface_type"], d["zone"],
+            d["area"], d["azimuth"], d["tilt"], d["n_vertices"]))
 
 
 def cmd_surface_info(args):
@@ -420,11 +447,8 @@ def cmd_surface_info(args):
     # Find associated fenestration (for building surfaces)
     if kind == "building":
         fens = _get_objects_by_type(objects, "FenestrationSurface:Detailed")
-        children = []
-        for f in fens:
-            fd = extract_fenestration_data(f)
-            if fd["parent_surface"].lower() == target:
-                children.append(fd)
+        children = [extract_fenestration_data(f) for f in fens
+                    if _field_lower(f, 3) == target]
         if children:
             print(f"\n  --- Associated Fenestration ({len(children)}) ---")
             for c in children:
@@ -434,9 +458,8 @@ def cmd_surface_info(args):
 
 def cmd_scale(args):
     """Scale zone geometry along an axis."""
-    parse_idf = _load_idf_helper()
     idf_path = os.path.abspath(args.idf)
-    objects = parse_idf(idf_path)
+    objects, lines = _parse_idf_with_lines(idf_path)
 
     axis = args.axis.upper()
     axis_idx = {"X": 0, "Y": 1, "Z": 2}.get(axis)
@@ -447,46 +470,30 @@ def cmd_scale(args):
     factor = args.factor
     zone_filter = args.zone.lower()
 
-    # Find zone centroid for scaling reference
+    # Only names and vertices are needed; area/orientation are not computed
     surfaces = _get_objects_by_type(objects, "BuildingSurface:Detailed")
-    zone_surfaces = [extract_surface_data(s) for s in surfaces
+    zone_surfaces = [_surface_name_vertices(s, 11) for s in surfaces
                      if zone_filter in s["fields"][3].strip().lower()]
 
     if not zone_surfaces:
         print(f"Error: No surfaces found for zone matching '{args.zone}'")
         sys.exit(1)
 
-    # Compute zone centroid (average of all vertices)
-    all_verts = []
-    for sd in zone_surfaces:
-        all_verts.extend(sd["vertices"])
-    ref = centroid(all_verts)
-
-    # Scale vertices relative to centroid
-    surface_mods = {}
-    for sd in zone_surfaces:
-        new_verts = []
-        for v in sd["vertices"]:
-            nv = list(v)
-            nv[axis_idx] = ref[axis_idx] + (v[axis_idx] - ref[axis_idx]) * factor
-            new_verts.append(tuple(nv))
-        surface_mods[sd["name"]] = new_verts
+    # Scale relative to the zone centroid (average of all vertices)
+    ref = centroid([v for _, verts in zone_surfaces for v in verts])[axis_idx]
+    surface_mods = {name: _scale_vertices(verts, axis_idx, ref, factor)
+                    for name, verts in zone_surfaces}
 
     # Also scale fenestration surfaces on matching parent walls
     fens = _get_objects_by_type(objects, "FenestrationSurface:Detailed")
-    zone_surface_names = {sd["name"].lower() for sd in zone_surfaces}
+    zone_surface_names = {name.lower() for name, _ in zone_surfaces}
     for fobj in fens:
-        fd = extract_fenestration_data(fobj)
-        if fd["parent_surface"].lower() in zone_surface_names:
-            new_verts = []
-            for v in fd["vertices"]:
-                nv = list(v)
-                nv[axis_idx] = ref[axis_idx] + (v[axis_idx] - ref[axis_idx]) * factor
-                new_verts.append(tuple(nv))
-            surface_mods[fd["name"]] = new_verts
+        if _field_lower(fobj, 3) in zone_surface_names:
+            name, verts = _surface_name_vertices(fobj, 9)
+            surface_mods[name] = _scale_vertices(verts, axis_idx, ref, factor)
 
     output = os.path.abspath(args.output)
-    count = modify_idf_surfaces(idf_path, output, surface_mods)
+    count = modify_idf_surfaces(idf_path, output, surface_mods, objects, lines)
     print(f"=== Scale: {axis} x {factor} ===")
     print(f"  Zone:     {args.zone}")
     print(f"  Modified: {count} surfaces")
@@ -495,15 +502,14 @@ def cmd_scale(args):
 
 def cmd_set_height(args):
     """Set zone ceiling height by adjusting Z coordinates."""
-    parse_idf = _load_idf_helper()
     idf_path = os.path.abspath(args.idf)
-    objects = parse_idf(idf_path)
+    objects, lines = _parse_idf_with_lines(idf_path)
 
     new_height = args.height
     zone_filter = args.zone.lower()
 
     surfaces = _get_objects_by_type(objects, "BuildingSurface:Detailed")
-    zone_surfaces = [extract_surface_data(s) for s in surfaces
+    zone_surfaces = [_surface_name_vertices(s, 11) for s in surfaces
                      if zone_filter in s["fields"][3].strip().lower()]
 
     if not zone_surfaces:
@@ -511,11 +517,7 @@ def cmd_set_height(args):
         sys.exit(1)
 
     # Find current Z range
-    all_z = []
-    for sd in zone_surfaces:
-        for v in sd["vertices"]:
-            all_z.append(v[2])
-
+    all_z = [v[2] for _, verts in zone_surfaces for v in verts]
     z_min = min(all_z)
     z_max = max(all_z)
     current_height = z_max - z_min
@@ -527,28 +529,19 @@ def cmd_set_height(args):
     z_factor = new_height / current_height
 
     # Scale Z coordinates relative to z_min
-    surface_mods = {}
-    for sd in zone_surfaces:
-        new_verts = []
-        for v in sd["vertices"]:
-            new_z = z_min + (v[2] - z_min) * z_factor
-            new_verts.append((v[0], v[1], new_z))
-        surface_mods[sd["name"]] = new_verts
+    surface_mods = {name: _scale_vertices(verts, 2, z_min, z_factor)
+                    for name, verts in zone_surfaces}
 
     # Also update fenestration
     fens = _get_objects_by_type(objects, "FenestrationSurface:Detailed")
-    zone_surface_names = {sd["name"].lower() for sd in zone_surfaces}
+    zone_surface_names = {name.lower() for name, _ in zone_surfaces}
     for fobj in fens:
-        fd = extract_fenestration_data(fobj)
-        if fd["parent_surface"].lower() in zone_surface_names:
-            new_verts = []
-            for v in fd["vertices"]:
-                new_z = z_min + (v[2] - z_min) * z_factor
-                new_verts.append((v[0], v[1], new_z))
-            surface_mods[fd["name"]] = new_verts
+        if _field_lower(fobj, 3) in zone_surface_names:
+            name, verts = _surface_name_vertices(fobj, 9)
+            surface_mods[name] = _scale_vertices(verts, 2, z_min, z_factor)
 
     output = os.path.abspath(args.output)
-    count = modify_idf_surfaces(idf_path, output, surface_mods)
+    count = modify_idf_surfaces(idf_path, output, surface_mods, objects, lines)
     print(f"=== Set Height: {new_height}m ===")
     print(f"  Zone:            {args.zone}")
     print(f"  Previous height: {current_height:.2f}m")
@@ -559,9 +552,8 @@ def cmd_set_height(args):
 
 def cmd_move_wall(args):
     """Move a wall surface along its outward normal direction."""
-    parse_idf = _load_idf_helper()
     idf_path = os.path.abspath(args.idf)
-    objects = parse_idf(idf_path)
+    objects, lines = _parse_idf_with_lines(idf_path)
 
     target = args.surface.lower()
     offset = args.offset
@@ -570,9 +562,8 @@ def cmd_move_wall(args):
     surfaces = _get_objects_by_type(objects, "BuildingSurface:Detailed")
     wall_data = None
     for s in surfaces:
-        sd = extract_surface_data(s)
-        if sd["name"].lower() == target:
-            wall_data = sd
+        if _field_lower(s, 0) == target:
+            wall_data = extract_surface_data(s)
             break
 
     if not wall_data:
@@ -599,8 +590,8 @@ def cmd_move_wall(args):
     # Also move fenestration on this wall
     fens = _get_objects_by_type(objects, "FenestrationSurface:Detailed")
     for fobj in fens:
-        fd = extract_fenestration_data(fobj)
-        if fd["parent_surface"].lower() == target:
+        if _field_lower(fobj, 3) == target:
+            fd = extract_fenestration_data(fobj)
             new_fverts = []
             for v in fd["vertices"]:
                 new_fverts.append((
@@ -611,7 +602,7 @@ def cmd_move_wall(args):
             surface_mods[fd["name"]] = new_fverts
 
     output = os.path.abspath(args.output)
-    count = modify_idf_surfaces(idf_path, output, surface_mods)
+    count = modify_idf_surfaces(idf_path, output, surface_mods, objects, lines)
     print(f"=== Move Wall ===")
     print(f"  Surface:   {wall_data['name']}")
     print(f"  Normal:    ({normal[0]:.3f}, {normal[1]:.3f}, {normal[2]:.3f})")
@@ -636,21 +627,28 @@ def cmd_summary(args):
     surf_data = [extract_surface_data(s) for s in surfaces]
     fen_data = [extract_fenestration_data(f) for f in fens]
 
-    # Build fenestration parent map
-    fen_by_parent = {}
+    # Window areas by parent surface name (lowercase), in file order
+    window_areas_by_parent = {}
     for fd in fen_data:
-        parent = fd["parent_surface"].lower()
-        if parent not in fen_by_parent:
-            fen_by_parent[parent] = []
-        fen_by_parent[parent].append(fd)
+        if fd["surface_type"].lower() == "window":
+            parent = fd["parent_surface"].lower()
+            window_areas_by_parent.setdefault(parent, []).append(fd["area"])
 
-    # Group by zone
+    # One pass over the surfaces, accumulating per zone (in file order):
+    # [floor area, exterior wall area, window area on those walls, count]
     zones = {}
     for sd in surf_data:
-        zone = sd["zone"]
-        if zone not in zones:
-            zones[zone] = []
-        zones[zone].append(sd)
+        totals = zones.get(sd["zone"])
+        if totals is None:
+            totals = zones[sd["zone"]] = [0, 0, 0, 0]
+        totals[3] += 1
+        stype = sd["surface_type"].lower()
+        if stype == "floor":
+            totals[0] += sd["area"]
+        elif stype == "wall" and sd["boundary"].lower() == "outdoors":
+            totals[1] += sd["area"]
+            for area in window_areas_by_parent.get(sd["name"].lower(), ()):
+                totals[2] += area
 
     print(f"=== Geometry Summary ===")
     print(f"  Zones: {len(zones)}")
@@ -668,21 +666,7 @@ def cmd_summary(args):
     print(f"  {'-'*78}")
 
     for zone_name in sorted(zones.keys()):
-        zone_surfs = zones[zone_name]
-        floor_area = sum(sd["area"] for sd in zone_surfs
-                        if sd["surface_type"].lower() == "floor")
-        ext_wall_area = sum(sd["area"] for sd in zone_surfs
-                           if sd["surface_type"].lower() == "wall"
-                           and sd["boundary"].lower() == "outdoors")
-
-        # Window area on exterior walls
-        window_area = 0
-        for sd in zone_surfs:
-            if sd["surface_type"].lower() == "wall" and sd["boundary"].lower() == "outdoors":
-                children = fen_by_parent.get(sd["name"].lower(), [])
-                for c in children:
-                    if c["surface_type"].lower() == "window":
-                        window_area += c["area"]
+        floor_area, ext_wall_area, window_area, n_surfs = zones[zone_name]
 
         wwr = (window_area / ext_wall_area * 100) if ext_wall_area > 0.01 else 0
 
@@ -692,7 +676,7 @@ def cmd_summary(args):
 
         zn = zone_name[:30]
         print(f"  {zn:<30s} {floor_area:>10.2f} {ext_wall_area:>12.2f} "
-              f"{window_area:>11.2f} {wwr:>7.1f} {len(zone_surfs):>8d}")
+              f"{window_area:>11.2f} {wwr:>7.1f} {n_surfs:>8d}")
 
     # Totals
     total_wwr = (total_window / total_wall_ext * 100) if total_wall_ext > 0.01 else 0
@@ -705,68 +689,64 @@ def cmd_summary(args):
 # Geometry creation helpers
 # ---------------------------------------------------------------------------
 
+# Field comments for generated objects; the header templates are built once
+# and filled with str.format per surface.
+_SURFACE_FIELD_LABELS = (
+    "Name",
+    "Surface Type",
+    "Construction Name",
+    "Zone Name",
+    "Space Name",
+    "Outside Boundary Condition",
+    "Outside Boundary Condition Object",
+    "Sun Exposure",
+    "Wind Exposure",
+    "View Factor to Ground",
+    "Number of Vertices",
+)
+_FENESTRATION_FIELD_LABELS = (
+    "Name",
+    "Surface Type",
+    "Construction Name",
+    "Building Surface Name",
+    "Outside Boundary Condition Object",
+    "View Factor to Ground",
+    "Frame and Divider Name",
+    "Multiplier",
+    "Number of Vertices",
+)
+_SURFACE_HEADER_FMT = "\n".join(
+    ["BuildingSurface:Detailed,"]
+    + [f"    {{}},  !- {label}" for label in _SURFACE_FIELD_LABELS])
+_FENESTRATION_HEADER_FMT = "\n".join(
+    ["FenestrationSurface:Detailed,"]
+    + [f"    {{}},  !- {label}" for label in _FENESTRATION_FIELD_LABELS])
+
+
+def _idf_vertex_lines(vertices):
+    """Format vertex blocks; the last Z coordinate ends the object."""
+    last = len(vertices) - 1
+    return [f"    {_fmt_coord(x)},  !- Vertex {i + 1} X-coordinate {{m}}\n"
+            f"    {_fmt_coord(y)},  !- Vertex {i + 1} Y-coordinate {{m}}\n"
+            f"    {_fmt_coord(z)}{';' if i == last else ','}"
+            f"  !- Vertex {i + 1} Z-coordinate {{m}}"
+            for i, (x, y, z) in enumerate(vertices)]
+
+
 def _idf_surface(name, stype, construction, zone, space, boundary,
                  boundary_obj, sun, wind, vertices):
     """Generate BuildingSurface:Detailed IDF text."""
-    lines = ["BuildingSurface:Detailed,"]
-    fields = [
-        (name, "Name"),
-        (stype, "Surface Type"),
-        (construction, "Construction Name"),
-        (zone, "Zone Name"),
-        (space, "Space Name"),
-        (boundary, "Outside Boundary Condition"),
-        (boundary_obj, "Outside Boundary Condition Object"),
-        (sun, "Sun Exposure"),
-        (wind, "Wind Exposure"),
-        ("", "View Factor to Ground"),
-        ("", "Number of Vertices"),
-    ]
-    for val, comment in fields:
-        lines.append(f"    {val},  !- {comment}")
-    for i, (x, y, z) in enumerate(vertices):
-        vi = i + 1
-        coord_idx = (i % 1) + 1  # simplified
-        xs = _fmt_coord(x)
-        ys = _fmt_coord(y)
-        zs = _fmt_coord(z)
-        if i == len(vertices) - 1:
-            lines.append(f"    {xs},  !- Vertex {vi} X-coordinate {{m}}")
-            lines.append(f"    {ys},  !- Vertex {vi} Y-coordinate {{m}}")
-            lines.append(f"    {zs};  !- Vertex {vi} Z-coordinate {{m}}")
-        else:
-            lines.append(f"    {xs},  !- Vertex {vi} X-coordinate {{m}}")
-            lines.append(f"    {ys},  !- Vertex {vi} Y-coordinate {{m}}")
-            lines.append(f"    {zs},  !- Vertex {vi} Z-coordinate {{m}}")
-    return "\n".join(lines)
+    header = _SURFACE_HEADER_FMT.format(name, stype, construction, zone, space,
+                                        boundary, boundary_obj, sun, wind,
+                                        "", "")
+    return "\n".join([header] + _idf_vertex_lines(vertices))
 
 
 def _idf_fenestration(name, stype, construction, parent_surface, vertices):
     """Generate FenestrationSurface:Detailed IDF text."""
-    lines = ["FenestrationSurface:Detailed,"]
-    fields = [
-        (name, "Name"),
-        (stype, "Surface Type"),
-        (construction, "Construction Name"),
-        (parent_surface, "Building Surface Name"),
-        ("", "Outside Boundary Condition Object"),
-        ("", "View Factor to Ground"),
-        ("", "Frame and Divider Name"),
-        ("", "Multiplier"),
-        ("", "Number of Vertices"),
-    ]
-    for val, comment in fields:
-        lines.append(f"    {val},  !- {comment}")
-    for i, (x, y, z) in enumerate(vertices):
-        vi = i + 1
-        xs = _fmt_coord(x)
-        ys = _fmt_coord(y)
-        zs = _fmt_coord(z)
-        sep = ";" if i == len(vertices) - 1 else ","
-        lines.append(f"    {xs},  !- Vertex {vi} X-coordinate {{m}}")
-        lines.append(f"    {ys},  !- Vertex {vi} Y-coordinate {{m}}")
-        lines.append(f"    {zs}{sep}  !- Vertex {vi} Z-coordinate {{m}}")
-    return "\n".join(lines)
+    header = _FENESTRATION_HEADER_FMT.format(name, stype, construction,
+                                             parent_surface, "", "", "", "", "")
+    return "\n".join([header] + _idf_vertex_lines(vertices))
 
 
 def _box_surfaces(zone_name, space_name, w, d, h,
@@ -1017,18 +997,16 @@ def cmd_create_l_shape(args):
 
 def cmd_add_window(args):
     """Add a window to a specified wall surface."""
-    parse_idf = _load_idf_helper()
     idf_path = os.path.abspath(args.idf)
-    objects = parse_idf(idf_path)
+    objects, lines = _parse_idf_with_lines(idf_path)
 
     # Find the target wall
     target = args.wall.lower()
     surfaces = _get_objects_by_type(objects, "BuildingSurface:Detailed")
     wall_data = None
     for s in surfaces:
-        sd = extract_surface_data(s)
-        if sd["name"].lower() == target:
-            wall_data = sd
+        if _field_lower(s, 0) == target:
+            wall_data = extract_surface_data(s)
             break
 
     if not wall_data:
@@ -1102,12 +1080,9 @@ def cmd_add_window(args):
         win_name, "Window", construction, wall_data["name"], win_verts)
 
     # Append to IDF file
-    with open(idf_path, "r", encoding="utf-8", errors="replace") as f:
-        content = f.read()
-
     output = os.path.abspath(args.output)
     with open(output, "w", encoding="utf-8") as f:
-        f.write(content)
+        f.writelines(lines)
         f.write("\n\n")
         f.write(fen_text)
         f.write("\n")
@@ -33,48 +33,53 @@ def parse_idf(filepath):
         print(f"Error: IDF file not found: {filepath}")
         sys.exit(1)
 
+    with open(filepath, "r", encoding="utf-8", errors="replace") as f:
+        return parse_idf_lines(f)
+
+
+def parse_idf_lines(lines):
+    """Parse IDF text lines (e.g. an open file or its readlines()) like parse_idf."""
     objects = []
     current_lines = []
     current_start = 0
     in_object = False
 
-    with open(filepath, "r", encoding="utf-8", errors="replace") as f:
-        for line_num, line in enumerate(f, 1):
-            # Remove inline comments (but preserve the line for raw text)
-            stripped = line.strip()
-
-            # Skip pure comment lines and empty lines when not in object
-            if not in_object:
-                if not stripped or stripped.startswith("!"):
-                    continue
-
-                # Check if this starts a new object
-                # Object lines have no leading whitespace and contain a comma or semicolon
-                if not line.startswith(" ") and not line.startswith("\t"):
-                    # Remove comment portion
-                    code_part = stripped.split("!")[0].strip()
-                    if code_part and ("," in code_part or ";" in code_part):
-                        in_object = True
-                        current_lines = [line]
-                        current_start = line_num
-                        if ";" in code_part:
-                            # Single-line object
-                            obj = _finalize_object(current_lines, current_start, line_num)
-                            if obj:
-                                objects.append(obj)
-                            in_object = False
-                continue
+    for line_num, line in enumerate(lines, 1):
+        # Remove inline comments (but preserve the line for raw text)
+        stripped = line.strip()
 
-            # We're inside an object
-            current_lines.append(line)
+        # Skip pure comment lines and empty lines when not in object
+        if not in_object:
+            if not stripped or stripped.startswith("!"):
+                continue
 
-            # Check if this line terminates the object
-            code_part = stripped.split("!")[0].strip()
-            if ";" in code_part:
-                obj = _finalize_object(current_lines, current_start, line_num)
-                if obj:
-                    objects.append(obj)
-                in_object = False
+            # Check if this starts a new object
+            # Object lines have no leading whitespace and contain a comma or semicolon
+            if not line.startswith(" ") and not line.startswith("\t"):
+                # Remove comment portion
+                code_part = stripped.split("!")[0].strip()
+                if code_part and ("," in code_part or ";" in code_part):
+                    in_object = True
+                    current_lines = [line]
+                    current_start = line_num
+                    if ";" in code_part:
+                        # Single-line object
+                        obj = _finalize_object(current_lines, current_start, line_num)
+                        if obj:
+                            objects.append(obj)
+                        in_object = False
+            continue
+
+        # We're inside an object
+        current_lines.append(line)
+
+        # Check if this line terminates the object
+        code_part = stripped.split("!")[0].strip()
+        if ";" in code_part:
+            obj = _finalize_object(current_lines, current_start, line_num)
+            if obj:
+                objects.append(obj)
+            in_object = False
 
     # Handle unclosed object at end of file
     if in_object and current_lines: